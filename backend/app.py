@@ -1,37 +1,69 @@
 import os
 import re
+import html
 import json
 import bcrypt
 import jwt
 import datetime
+import time
 import urllib.request
 import urllib.error
-import io
-import docx
-from pdfminer.high_level import extract_text as extract_pdf_text
-from groq import Groq
-from flask import Flask, request, jsonify, make_response
+import zipfile
+import atexit
+import socket
+from flask import Blueprint, Flask, Response, request, jsonify, make_response
 from dotenv import load_dotenv
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from lint_engine import LintEngine
+from ats_match import resume_terms, score_resumes
+from previews import Thumbnailer, encode_preview
+from providers import ClientDisconnected, Deadline, DeadlineExceeded, ProviderRegistry
+from suggest_cache import SuggestionCache, summary_key
+import revisions
+from renderer import RENDER_FORMATS, RenderCache, RenderService
+from write_buffer import WriteBuffer
+from repository import Repository, SQLitePool
+from uploads import open_view, read_text, sniff_kind, spooled_request_class
+from docx_text import extract_docx
 
 load_dotenv()
 
-app = Flask(__name__)
+# ─── Route groups ─────────────────────────────────────────────────────────────
+#
+# Routes live on one blueprint per group so a deployment role can serve a subset
+# (see create_app / ROUTE_GROUPS at the bottom). "core" — CORS and /api/health — is always on.
+
+core_bp    = Blueprint("core", __name__)
+auth_bp    = Blueprint("auth", __name__)
+resumes_bp = Blueprint("resumes", __name__, cli_group=None)
+render_bp  = Blueprint("render", __name__)
+ai_bp      = Blueprint("ai", __name__)
+tools_bp   = Blueprint("tools", __name__)
+
+BLUEPRINTS = {"auth": auth_bp, "resumes": resumes_bp, "render": render_bp, "ai": ai_bp, "tools": tools_bp}
 
 # ─── CORS: allow any localhost / 127.0.0.1 origin on any port ────────────────
 _LOCALHOST_RE = re.compile(r"^https?://(localhost|127\.0\.0\.1)(:\d+)?$")
 
-@app.after_request
+@core_bp.after_app_request
 def _add_cors(response):
     origin = request.headers.get("Origin", "")
     if _LOCALHOST_RE.match(origin):
         response.headers["Access-Control-Allow-Origin"]  = origin
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, X-Request-Deadline-Ms"
         response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
     return response
 
-@app.route("/api/<path:path>", methods=["OPTIONS"])
-@app.route("/api/", methods=["OPTIONS"])
+def _upload_too_large():
+    return jsonify({"error": f"File is too large. The limit is {MAX_UPLOAD_BYTES // (1024 * 1024)} MB."}), 413
+
+@core_bp.app_errorhandler(413)
+def _request_too_large(e):
+    return _upload_too_large()
+
+@core_bp.route("/api/<path:path>", methods=["OPTIONS"])
+@core_bp.route("/api/", methods=["OPTIONS"])
 def _handle_options(path=""):
     return make_response("", 204)
 
@@ -43,10 +75,10 @@ DATABASE_URL = os.getenv("DATABASE_URL", "")
 USE_POSTGRES = DATABASE_URL.startswith("postgresql")
 
 if USE_POSTGRES:
-    import psycopg2
-    import psycopg2.extras
+    SEARCH_ENABLED = True
 
     def get_db():
+        import psycopg2.extras  # imported on first connection, not at boot
         return psycopg2.connect(DATABASE_URL, cursor_factory=psycopg2.extras.RealDictCursor)
 
     def init_db():
@@ -68,6 +100,24 @@ if USE_POSTGRES:
                 data        TEXT NOT NULL DEFAULT '{}',
                 updated_at  TIMESTAMP WITH TIME ZONE DEFAULT NOW()
             );
+            ALTER TABLE resumes ADD COLUMN IF NOT EXISTS search_text TEXT NOT NULL DEFAULT '';
+            ALTER TABLE resumes ADD COLUMN IF NOT EXISTS search_tsv  TSVECTOR;
+            CREATE INDEX IF NOT EXISTS resumes_search_idx ON resumes USING GIN (search_tsv);
+            ALTER TABLE resumes ADD COLUMN IF NOT EXISTS ats_terms TEXT;
+            ALTER TABLE resumes ADD COLUMN IF NOT EXISTS preview   TEXT;
+            ALTER TABLE resumes ADD COLUMN IF NOT EXISTS thumbnail TEXT;
+            CREATE TABLE IF NOT EXISTS resume_revisions (
+                id          SERIAL PRIMARY KEY,
+                resume_id   INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE,
+                rev         INTEGER NOT NULL,
+                kind        VARCHAR(5) NOT NULL,
+                payload     TEXT NOT NULL,
+                size        INTEGER NOT NULL,
+                saves       INTEGER NOT NULL DEFAULT 1,
+                created_at  TEXT NOT NULL,
+                saved_at    DOUBLE PRECISION NOT NULL,
+                UNIQUE (resume_id, rev)
+            );
         """)
         conn.commit(); cur.close(); conn.close()
         print("✅  PostgreSQL database initialized.")
@@ -76,16 +126,28 @@ else:
     import sqlite3
     DB_PATH = os.path.join(os.path.dirname(__file__), "resume_builder.db")
 
-    def _dict_factory(cursor, row):
-        return {col[0]: row[idx] for idx, col in enumerate(cursor.description)}
+    def _has_fts5():
+        try:
+            sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    SEARCH_ENABLED = _has_fts5()
+
+    SQLITE_POOL_SIZE         = int(os.getenv("SQLITE_POOL_SIZE", "8"))
+    SQLITE_CACHED_STATEMENTS = int(os.getenv("SQLITE_CACHED_STATEMENTS", "256"))
+    _pool = None
 
     def get_db():
+        """A pooled connection; close() returns it to the pool with its statement cache intact."""
+        global _pool
         try:
-            # ensure the directory exists (not usually needed for file in same folder)
-            conn = sqlite3.connect(DB_PATH)
-            conn.row_factory = _dict_factory
-            conn.execute("PRAGMA journal_mode=WAL")
-            return conn
+            if _pool is None or _pool.path != DB_PATH:  # DB_PATH can be repointed after import
+                if _pool is not None:
+                    _pool.close_all()
+                _pool = SQLitePool(DB_PATH, SQLITE_POOL_SIZE, SQLITE_CACHED_STATEMENTS)
+            return _pool.connect()
         except Exception as e:
             print(f"[DB] failed to open sqlite database at {DB_PATH}: {e}")
             raise
@@ -108,7 +170,33 @@ else:
                 data        TEXT    NOT NULL DEFAULT '{}',
                 updated_at  DATETIME DEFAULT CURRENT_TIMESTAMP
             );
+            CREATE TABLE IF NOT EXISTS resume_revisions (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                resume_id   INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE,
+                rev         INTEGER NOT NULL,
+                kind        TEXT    NOT NULL,
+                payload     TEXT    NOT NULL,
+                size        INTEGER NOT NULL,
+                saves       INTEGER NOT NULL DEFAULT 1,
+                created_at  TEXT    NOT NULL,
+                saved_at    REAL    NOT NULL,
+                UNIQUE (resume_id, rev)
+            );
         """)
+        columns = {c["name"] for c in conn.execute("PRAGMA table_info(resumes)").fetchall()}
+        for column in ("ats_terms", "preview", "thumbnail"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE resumes ADD COLUMN {column} TEXT")
+        if SEARCH_ENABLED:
+            # rowid = resumes.id; user_id is stored (not indexed) to scope matches per account
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS resume_search USING fts5(
+                    name, summary, experience, skills, projects, user_id UNINDEXED,
+                    tokenize = 'porter unicode61'
+                )
+            """)
+        else:
+            print("⚠️  SQLite was built without FTS5 — resume search is disabled.")
         conn.commit(); conn.close()
         print(f"✅  SQLite database initialized at: {DB_PATH}")
 
@@ -152,21 +240,10 @@ def is_unique_violation(e):
     return "unique" in msg
 
 
-def db_exec(conn, sql, params=()):
-    """Unified execute for both PG (uses %s) and SQLite (uses ?)."""
-    if USE_POSTGRES:
-        cur = conn.cursor()
-        cur.execute(sql, params)
-        return cur
-    else:
-        return conn.execute(sql, params)
-
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "100"))
 
-def q(sql):
-    """Convert ? placeholders to %s for PostgreSQL."""
-    if USE_POSTGRES:
-        return sql.replace("?", "%s")
-    return sql
+# All SQL lives in repository.STATEMENTS, rendered once for the active backend.
+REPO = Repository(USE_POSTGRES, STREAM_CHUNK_SIZE)
 
 
 # ─── Resume Extraction Functions ──────────────────────────────────────────────
@@ -287,16 +364,7 @@ def manual_extract_resume(text: str) -> dict:
     }
 
 
-def extract_with_groq(text: str) -> dict | None:
-    """
-    Try to extract resume using GROQ API (free, unlimited).
-    Returns None if extraction fails, falls back to manual extraction.
-    """
-    if not GROQ_API_KEY:
-        return None
-    
-    try:
-        prompt = f"""Extract resume information from the following text and return as JSON.
+EXTRACT_PROMPT = """Extract resume information from the following text and return as JSON.
 Return ONLY valid JSON with this exact structure:
 {{
   "personalInfo": {{
@@ -320,140 +388,224 @@ Return ONLY valid JSON with this exact structure:
   ],
   "skills": ["skill1", "skill2"]
 }}
-
+{part_note}
 Resume text:
-{text[:8000]}
+{text}
 
 Return ONLY the JSON object, no markdown or explanations."""
 
-        client = Groq(api_key=GROQ_API_KEY)
-        message = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=2048
-        )
-        
-        response_text = message.choices[0].message.content
-        
-        # Clean markdown if present
-        response_text = re.sub(r"```json", "", response_text)
-        response_text = re.sub(r"```", "", response_text).strip()
-        
-        extracted = json.loads(response_text)
-        
-        # Ensure required structure
-        if "personalInfo" in extracted and "skills" in extracted:
-            # Add IDs and ensure all fields exist
-            for i, exp in enumerate(extracted.get("experience", [])):
-                exp["id"] = str(i)
-            for i, edu in enumerate(extracted.get("education", [])):
-                edu["id"] = str(i)
-            for i, proj in enumerate(extracted.get("projects", [])):
-                proj["id"] = str(i)
-                proj["startDate"] = proj.get("startDate", "")
-                proj["endDate"] = proj.get("endDate", "")
-                proj["url"] = ""  # Add url field
-                
-            return extracted
-    except Exception as e:
-        print(f"[Extract] GROQ extraction failed: {e}")
-    
-    return None
+EXTRACT_PART_NOTE = ("\nThis is part {index} of {total} of a longer resume. Extract only what appears in this part "
+                     "and leave every other field empty (\"\" or []).\n")
+
+# ~4 characters per token for English prose; a deliberately cheap, provider-agnostic estimate.
+EXTRACT_TOKEN_BUDGET = int(os.getenv("EXTRACT_TOKEN_BUDGET", "2000"))
+EXTRACT_MAX_CHUNKS   = int(os.getenv("EXTRACT_MAX_CHUNKS", "6"))
+
+SECTION_HEADING_RE = re.compile(
+    r"^\W*(professional\s+summary|summary|profile|objective|about\s+me|"
+    r"(?:work\s+|professional\s+)?experience|work\s+history|employment(?:\s+history)?|"
+    r"education|academic\s+background|(?:technical\s+)?skills|core\s+competencies|"
+    r"projects|certifications?|licenses|languages|awards|achievements|publications|"
+    r"volunteer(?:ing)?|extracurricular(?:\s+activities)?|interests|references)\W*$",
+    re.I,
+)
+_BOILERPLATE_RE = re.compile(r"^\s*(page\s+\d+(\s+of\s+\d+)?|[-_=•·.\s]+|references available upon request\.?)\s*$", re.I)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+def normalize_resume_text(text: str) -> str:
+    """Collapse runs of whitespace and drop page furniture (page numbers, rules) before prompting."""
+    lines = []
+    for line in text.replace("\r\n", "\n").replace("\r", "\n").replace("\f", "\n").split("\n"):
+        line = re.sub(r"[ \t\u00a0]+", " ", line).strip()
+        if line and _BOILERPLATE_RE.match(line):
+            continue
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return "\n".join(lines).strip()
 
 
-def extract_with_gemini(text: str) -> dict | None:
+def is_section_heading(line: str) -> bool:
+    return bool(SECTION_HEADING_RE.match(line.strip()))
+
+
+def split_resume_sections(text: str, headings: set | None = None) -> list:
+    """
+    Split resume text at detected section headings. The first element is the header block
+    (name / contact). `headings` lets an extractor pass lines it already knows are headings.
     """
-    Try to extract resume using Gemini API.
-    Returns None if extraction fails, falls back to manual extraction.
+    sections, current = [], []
+    for line in text.split("\n"):
+        if current and (is_section_heading(line) or (headings and line.strip() in headings)):
+            sections.append("\n".join(current).strip())
+            current = []
+        current.append(line)
+    if current:
+        sections.append("\n".join(current).strip())
+    return [sec for sec in sections if sec]
+
+
+def _split_long_line(line: str, limit: int) -> list:
+    """Cut a line longer than `limit` chars into pieces, at the last space before each cut where there is one."""
+    pieces = []
+    while len(line) > limit:
+        cut = line.rfind(" ", limit // 2, limit)
+        cut = cut if cut > 0 else limit
+        pieces.append(line[:cut].rstrip())
+        line = line[cut:].lstrip()
+    return pieces + [line] if line else pieces
+
+
+def chunk_resume_text(text: str, budget: int = EXTRACT_TOKEN_BUDGET, headings: set | None = None) -> list:
     """
-    if not GEMINI_API_KEY:
+    Pack whole sections greedily into chunks of at most `budget` tokens; a section that is too
+    big on its own is packed line by line, and a line that is too big (PDF text boxes, TXT files
+    without newlines) in budget-sized pieces. If that needs more than EXTRACT_MAX_CHUNKS requests,
+    the budget is raised instead of dropping the tail of the resume.
+    """
+    total = estimate_tokens(text)
+    if total <= budget:
+        return [text]
+    sections = split_resume_sections(text, headings)
+    budget   = max(budget, -(-total // EXTRACT_MAX_CHUNKS) + 64)
+    chunks   = _pack_sections(sections, budget, headings)
+    while len(chunks) > EXTRACT_MAX_CHUNKS:  # packing leaves slack at chunk ends; grow until it fits
+        budget += budget // 8
+        chunks  = _pack_sections(sections, budget, headings)
+    return chunks
+
+
+def _pack_sections(sections: list, budget: int, headings: set | None) -> list:
+    units = []
+    for section in sections:
+        if estimate_tokens(section) <= budget:
+            units.append(section)
+        else:
+            for line in section.split("\n"):
+                units.extend(_split_long_line(line, (budget - 64) * 4))  # room left for the section heading
+
+    chunks, current = [], ""
+    for unit in units:
+        sep = "\n\n" if "\n" in unit or is_section_heading(unit) or (headings and unit in headings) else "\n"
+        candidate = f"{current}{sep}{unit}" if current else unit
+        if current and estimate_tokens(candidate) > budget:
+            chunks.append(current)
+            candidate = unit
+        current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _entry_key(entry: dict, fields: tuple) -> tuple:
+    return tuple(re.sub(r"\W+", " ", str(entry.get(f) or "")).strip().lower() for f in fields)
+
+
+def merge_extracted(parts: list) -> dict:
+    """Merge partial extraction results from several chunks, de-duplicating list entries."""
+    merged = {"personalInfo": {}, "summary": "", "experience": [], "education": [], "projects": [], "skills": []}
+    dedupe = {"experience": ("company", "position", "startDate"), "education": ("school", "degree"), "projects": ("name",)}
+    seen   = {key: set() for key in dedupe}
+    skills = set()
+    for part in parts:
+        for field, value in (part.get("personalInfo") or {}).items():
+            if value and not merged["personalInfo"].get(field):
+                merged["personalInfo"][field] = value
+        if not merged["summary"] and part.get("summary"):
+            merged["summary"] = part["summary"]
+        for key, fields in dedupe.items():
+            for entry in part.get(key) or []:
+                ident = _entry_key(entry, fields)
+                if any(ident) and ident not in seen[key]:
+                    seen[key].add(ident)
+                    merged[key].append(entry)
+        for skill in part.get("skills") or []:
+            if isinstance(skill, str) and skill.strip() and skill.strip().lower() not in skills:
+                skills.add(skill.strip().lower())
+                merged["skills"].append(skill.strip())
+    return merged
+
+
+def _parse_extraction(response_text: str) -> dict | None:
+    # Clean markdown if present
+    response_text = re.sub(r"```json", "", response_text)
+    response_text = re.sub(r"```", "", response_text).strip()
+    extracted = json.loads(response_text)
+    return extracted if isinstance(extracted, dict) else None
+
+
+def _finalize_extracted(extracted: dict) -> dict | None:
+    # Ensure required structure
+    if "personalInfo" not in extracted or "skills" not in extracted:
         return None
-    
-    try:
-        prompt = f"""Extract resume information from the following text and return as JSON.
-Return ONLY valid JSON with this exact structure:
-{{
-  "personalInfo": {{
-    "fullName": "string",
-    "email": "string", 
-    "phone": "string",
-    "location": "string",
-    "title": "string",
-    "website": "string",
-    "linkedin": "string"
-  }},
-  "summary": "string (max 300 chars)",
-  "experience": [
-    {{"company": "string", "position": "string", "startDate": "string", "endDate": "string", "description": "string"}},
-  ],
-  "education": [
-    {{"school": "string", "degree": "string", "field": "string", "startDate": "string", "endDate": "string"}},
-  ],
-  "projects": [
-    {{"name": "string", "role": "string", "description": "string", "startDate": "string", "endDate": "string"}},
-  ],
-  "skills": ["skill1", "skill2"]
-}}
+    # Add IDs and ensure all fields exist
+    for i, exp in enumerate(extracted.get("experience", [])):
+        exp["id"] = str(i)
+    for i, edu in enumerate(extracted.get("education", [])):
+        edu["id"] = str(i)
+    for i, proj in enumerate(extracted.get("projects", [])):
+        proj["id"] = str(i)
+        proj["startDate"] = proj.get("startDate", "")
+        proj["endDate"] = proj.get("endDate", "")
+        proj["url"] = ""  # Add url field
+    return extracted
+
+
+def _extract_chunked(text: str, call, label: str, headings: set | None = None) -> dict | None:
+    """
+    Run `call(prompt) -> str` over the text: one request for typical resumes, or one request
+    per section-aligned chunk (in parallel) for long ones, whose results are then merged.
+    A chunk that fails or returns nothing usable fails the whole attempt — a merge with a
+    section missing is not a complete result — so the registry moves on to the next provider.
+    """
+    chunks = chunk_resume_text(text, headings=headings)
+    if len(chunks) == 1:
+        return _finalize_extracted(_parse_extraction(call(EXTRACT_PROMPT.format(part_note="", text=chunks[0]))) or {})
 
-Resume text:
-{text[:8000]}
+    def run(indexed):
+        index, chunk = indexed
+        note = EXTRACT_PART_NOTE.format(index=index + 1, total=len(chunks))
+        try:
+            return _parse_extraction(call(EXTRACT_PROMPT.format(part_note=note, text=chunk)))
+        except Exception as e:
+            print(f"[Extract] {label} chunk {index + 1}/{len(chunks)} failed: {e}")
+            return e
 
-Return ONLY the JSON object, no markdown or explanations."""
+    with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+        parts = list(pool.map(run, enumerate(chunks)))
+    failed = [i + 1 for i, p in enumerate(parts) if not isinstance(p, dict)]
+    if failed:
+        raise RuntimeError(f"chunk(s) {', '.join(map(str, failed))} of {len(chunks)} failed")
+    print(f"[Extract] {label} merged {len(chunks)} chunks")
+    return _finalize_extracted(merge_extracted(parts))
 
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={GEMINI_API_KEY}"
-        body = {
-            "contents": [{"parts": [{"text": prompt}]}],
-            "generationConfig": {"temperature": 0.3, "maxOutputTokens": 2048}
-        }
-        
-        data = json.dumps(body).encode("utf-8")
-        req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"}, method="POST")
-        
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
-            response_text = result["candidates"][0]["content"]["parts"][0]["text"]
-            
-            # Clean markdown if present
-            response_text = re.sub(r"```json", "", response_text)
-            response_text = re.sub(r"```", "", response_text).strip()
-            
-            extracted = json.loads(response_text)
-            
-            # Ensure required structure
-            if "personalInfo" in extracted and "skills" in extracted:
-                # Add IDs and ensure all fields exist
-                for i, exp in enumerate(extracted.get("experience", [])):
-                    exp["id"] = str(i)
-                for i, edu in enumerate(extracted.get("education", [])):
-                    edu["id"] = str(i)
-                for i, proj in enumerate(extracted.get("projects", [])):
-                    proj["id"] = str(i)
-                    proj["startDate"] = proj.get("startDate", "")
-                    proj["endDate"] = proj.get("endDate", "")
-                    proj["url"] = ""  # Add url field
-                    
-                return extracted
-    except Exception as e:
-        print(f"[Extract] Gemini extraction failed: {e}")
-    
-    return None
+
+def extract_with_ai(text: str, headings: set | None = None, deadline: Deadline | None = None) -> tuple:
+    """
+    Extract structured resume data through the provider registry (GROQ / Gemini).
+    `headings` are lines the file extractor knows to be section headings (DOCX heading styles).
+    Returns (result, provider) or (None, None) so the caller can fall back to manual extraction;
+    raises DeadlineExceeded once `deadline` runs out.
+    """
+    def work(provider, timeout):
+        # chunks of a long resume run in parallel, so each gets the whole attempt's timeout
+        call = lambda prompt: provider.complete(prompt, timeout=timeout, temperature=0.3, max_tokens=2048)
+        return _extract_chunked(text, call, provider.name, headings)
+    return PROVIDERS.run(work, names=EXTRACT_PROVIDERS, label="Extract", deadline=deadline)
 
 
 # ─── Health ───────────────────────────────────────────────────────────────────
 
-@app.route("/api/health", methods=["GET"])
+@core_bp.route("/api/health", methods=["GET"])
 def health():
     # simple DB ping to detect connectivity issues
     db_status = "unknown"
     try:
         conn = get_db()
-        if USE_POSTGRES:
-            cur = conn.cursor()
-            cur.execute("SELECT 1")
-            cur.close()
-        else:
-            conn.execute("SELECT 1")
+        REPO.one(conn, "ping")
         conn.close()
         db_status = "ok"
     except Exception as e:
@@ -465,12 +617,15 @@ def health():
         "message": "ResumeForge API 🚀",
         "database": "PostgreSQL" if USE_POSTGRES else "SQLite",
         "dbStatus": db_status,
+        "providers": PROVIDERS.snapshot(),
+        "suggestCache": SUGGEST_CACHE.snapshot(),
+        "writeBuffer": WRITE_BUFFER.snapshot(),
     })
 
 
 # ─── Auth ─────────────────────────────────────────────────────────────────────
 
-@app.route("/api/auth/register", methods=["POST"])
+@auth_bp.route("/api/auth/register", methods=["POST"])
 def register():
     data      = request.get_json(silent=True) or {}
     full_name = (data.get("full_name") or "").strip()
@@ -490,16 +645,8 @@ def register():
     hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
     try:
         conn = get_db()
-        if USE_POSTGRES:
-            cur = conn.cursor()
-            cur.execute("INSERT INTO users (full_name, email, password) VALUES (%s,%s,%s) RETURNING id,full_name,email",
-                        (full_name, email, hashed))
-            user = cur.fetchone(); conn.commit(); cur.close()
-        else:
-            cur = conn.execute("INSERT INTO users (full_name, email, password) VALUES (?,?,?)", (full_name, email, hashed))
-            conn.commit()
-            user = conn.execute("SELECT id,full_name,email FROM users WHERE id=?", (cur.lastrowid,)).fetchone()
-        conn.close()
+        user = REPO.write(conn, "user_insert", (full_name, email, hashed))
+        conn.commit(); conn.close()
     except Exception as e:
         if is_unique_violation(e):
             return jsonify({"errors": {"email": "An account with this email already exists."}}), 409
@@ -509,7 +656,7 @@ def register():
                     "user": {"id": user["id"], "full_name": user["full_name"], "email": user["email"]}}), 201
 
 
-@app.route("/api/auth/login", methods=["POST"])
+@auth_bp.route("/api/auth/login", methods=["POST"])
 def login():
     data     = request.get_json(silent=True) or {}
     email    = (data.get("email")    or "").strip().lower()
@@ -518,12 +665,7 @@ def login():
         return jsonify({"error": "Email and password are required."}), 400
     try:
         conn = get_db()
-        if USE_POSTGRES:
-            cur = conn.cursor()
-            cur.execute("SELECT id,full_name,email,password FROM users WHERE email=%s", (email,))
-            user = cur.fetchone(); cur.close()
-        else:
-            user = conn.execute("SELECT id,full_name,email,password FROM users WHERE email=?", (email,)).fetchone()
+        user = REPO.one(conn, "user_by_email", (email,))
         conn.close()
     except Exception as e:
         return jsonify({"error": f"Database error: {e}"}), 500
@@ -535,17 +677,12 @@ def login():
                     "user": {"id": user["id"], "full_name": user["full_name"], "email": user["email"]}})
 
 
-@app.route("/api/auth/me", methods=["GET"])
+@auth_bp.route("/api/auth/me", methods=["GET"])
 @token_required
 def me(payload):
     try:
         conn = get_db()
-        if USE_POSTGRES:
-            cur = conn.cursor()
-            cur.execute("SELECT id,full_name,email,created_at FROM users WHERE id=%s", (payload["sub"],))
-            user = cur.fetchone(); cur.close()
-        else:
-            user = conn.execute("SELECT id,full_name,email,created_at FROM users WHERE id=?", (payload["sub"],)).fetchone()
+        user = REPO.one(conn, "user_by_id", (payload["sub"],))
         conn.close()
     except Exception as e:
         return jsonify({"error": f"Database error: {e}"}), 500
@@ -555,64 +692,420 @@ def me(payload):
                              "email": user["email"], "created_at": str(user["created_at"])}})
 
 
+# ─── Full-text Search ─────────────────────────────────────────────────────────
+
+SEARCH_MAX_RESULTS = 50
+
+
+def search_fields(name: str, data: dict) -> dict:
+    """The searchable text of a resume, one entry per index column."""
+    def join(items, keys):
+        return "\n".join(" ".join(str(i.get(k) or "") for k in keys) for i in items or [] if isinstance(i, dict))
+    pi = data.get("personalInfo") or {}
+    return {
+        "name":       " ".join(filter(None, (name, pi.get("title")))),
+        "summary":    data.get("summary") or "",
+        "experience": join(data.get("experience"), ("position", "company", "description")),
+        "skills":     " ".join(s for s in data.get("skills") or [] if isinstance(s, str)),
+        "projects":   join(data.get("projects"), ("name", "role", "description")),
+    }
+
+
+def _search_params(resume_id, user_id, name: str, data: dict) -> tuple:
+    f = search_fields(name, data)
+    if USE_POSTGRES:
+        return ("\n".join(f.values()), f["name"], f["skills"], f["summary"], f["experience"], f["projects"], resume_id)
+    return (resume_id, f["name"], f["summary"], f["experience"], f["skills"], f["projects"], user_id)
+
+
+def index_resumes(conn, rows: list):
+    """
+    Refresh the search index for (resume_id, user_id, name, data) rows in one batched
+    statement per step, inside the caller's transaction.
+    """
+    if not SEARCH_ENABLED or not rows:
+        return
+    if not USE_POSTGRES:
+        REPO.many(conn, "search_unindex", [(row[0],) for row in rows])
+    REPO.many(conn, "search_index", [_search_params(*row) for row in rows])
+
+
+def index_resume(conn, resume_id, user_id, name: str, data: dict):
+    """Refresh the search index for one resume, inside the caller's transaction."""
+    index_resumes(conn, [(resume_id, user_id, name, data)])
+
+
+def unindex_resume(conn, resume_id):
+    # PG keeps the index in columns of the row itself, so only SQLite has anything to clean up
+    if SEARCH_ENABLED and not USE_POSTGRES:
+        REPO.execute(conn, "search_unindex", (resume_id,))
+
+
+def backfill_search_index(batch_size: int = 200) -> int:
+    """(Re)index every stored resume. Reads through a streaming cursor and writes in batches."""
+    read_conn, write_conn = get_db(), get_db()
+    count, batch = 0, []
+    try:
+        for row in REPO.stream(read_conn, "resume_all"):
+            batch.append((row["id"], row["user_id"], row["name"], json.loads(row["data"])))
+            if len(batch) == batch_size:
+                index_resumes(write_conn, batch)
+                write_conn.commit()
+                count += len(batch); batch = []
+        index_resumes(write_conn, batch)
+        write_conn.commit()
+        count += len(batch)
+    finally:
+        read_conn.close(); write_conn.close()
+    return count
+
+
+@resumes_bp.cli.command("backfill-search")
+def _backfill_search_command():
+    """Build the full-text index for resumes saved before search existed."""
+    init_db()
+    print(f"🔎  Indexed {backfill_search_index()} resumes.")
+
+
+def _highlight(snippet: str | None) -> str:
+    """The stored text is user content: escape it, then turn the match delimiters into <mark> tags."""
+    return html.escape(snippet or "").replace("\x02", "<mark>").replace("\x03", "</mark>")
+
+
+def _search_terms(query: str) -> list:
+    return re.findall(r"\w+", query.lower())[:12]
+
+
+@resumes_bp.route("/api/resumes/search", methods=["GET"])
+@token_required
+def search_resumes(payload):
+    """Ranked, highlighted full-text search over the current user's resumes. Terms are prefix-matched."""
+    terms = _search_terms(request.args.get("q", ""))
+    if not terms:
+        return jsonify({"results": []})
+    if not SEARCH_ENABLED:
+        return jsonify({"error": "Search is not available on this server."}), 501
+    limit = max(1, min(request.args.get("limit", 20, type=int), SEARCH_MAX_RESULTS))
+    try:
+        WRITE_BUFFER.flush_owner(payload["sub"])
+        if USE_POSTGRES:
+            match = " & ".join(f"{t}:*" for t in terms)
+        else:
+            match = " ".join('"{}"*'.format(t) for t in terms)
+        conn = get_db()
+        rows = REPO.all(conn, "search_query", (match, payload["sub"], limit))
+        conn.close()
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    return jsonify({"results": [{"id": str(r["id"]), "name": r["name"], "templateId": r["template_id"],
+                                 "updatedAt": str(r["updated_at"]), "rank": round(float(r["rank"]), 4),
+                                 "snippet": _highlight(r["snippet"])} for r in rows]})
+
+
+# ─── Revision History ─────────────────────────────────────────────────────────
+#
+# Each save becomes a revision: a full snapshot every REVISION_SNAPSHOT_EVERY revisions,
+# a delta against the previous revision otherwise (see revisions.py). Saves arriving within
+# REVISION_COALESCE_SECONDS of the latest revision's creation are folded into it; the window
+# does not slide with each fold, so a long editing session still leaves one revision per window.
+# Only the newest REVISION_MAX revisions are kept — the oldest survivor is rewritten as a full snapshot.
+
+REVISION_SNAPSHOT_EVERY   = int(os.getenv("REVISION_SNAPSHOT_EVERY", "10"))
+REVISION_COALESCE_SECONDS = float(os.getenv("REVISION_COALESCE_SECONDS", "120"))
+REVISION_MAX              = int(os.getenv("REVISION_MAX", "50"))
+
+
+def _revision_doc(name: str, tpl_id: str, data: dict) -> dict:
+    return {"name": name, "templateId": tpl_id, "data": data}
+
+
+def _encode_revision(prev_doc, doc, full: bool) -> tuple:
+    """(kind, payload JSON) — falls back to a full snapshot when the delta would not be smaller."""
+    snapshot = json.dumps(doc, separators=(",", ":"))
+    if full or prev_doc is None:
+        return "full", snapshot
+    delta = json.dumps(revisions.diff(prev_doc, doc), separators=(",", ":"))
+    return ("delta", delta) if len(delta) < len(snapshot) else ("full", snapshot)
+
+
+def load_revision(conn, resume_id, rev):
+    """Materialise revision `rev` from the nearest full snapshot at or before it."""
+    rows = REPO.all(conn, "revision_chain", (resume_id, rev, resume_id, rev))
+    if not rows or rows[-1]["rev"] != rev:
+        return None
+    return revisions.materialize([(r["kind"], json.loads(r["payload"])) for r in rows])
+
+
+def _compact_revisions(conn, resume_id, latest_rev):
+    oldest_keep = latest_rev - REVISION_MAX + 1
+    first = REPO.one(conn, "revision_first", (resume_id,))
+    if oldest_keep <= 1 or first["rev"] >= oldest_keep:
+        return
+    snapshot = json.dumps(load_revision(conn, resume_id, oldest_keep), separators=(",", ":"))
+    REPO.execute(conn, "revision_trim", (resume_id, oldest_keep))
+    REPO.execute(conn, "revision_rebase", (snapshot, len(snapshot), resume_id, oldest_keep))
+
+
+def record_revision(conn, resume_id, name: str, tpl_id: str, data: dict):
+    """Record a save in the revision history, inside the caller's transaction."""
+    doc    = _revision_doc(name, tpl_id, data)
+    now    = time.time()
+    latest = REPO.one(conn, "revision_latest", (resume_id,))
+    if latest is None:
+        kind, payload = _encode_revision(None, doc, True)
+        rev = 1
+    else:
+        current = load_revision(conn, resume_id, latest["rev"])
+        if current == doc:
+            return
+        started = datetime.datetime.fromisoformat(latest["created_at"]).replace(tzinfo=datetime.timezone.utc)
+        if now - started.timestamp() < REVISION_COALESCE_SECONDS:
+            # Autosave burst: rewrite the latest revision rather than appending a new one
+            prev = load_revision(conn, resume_id, latest["rev"] - 1) if latest["kind"] == "delta" else None
+            kind, payload = _encode_revision(prev, doc, prev is None)
+            REPO.execute(conn, "revision_fold", (kind, payload, len(payload), now, resume_id, latest["rev"]))
+            return
+        rev = latest["rev"] + 1
+        kind, payload = _encode_revision(current, doc, (rev - 1) % REVISION_SNAPSHOT_EVERY == 0)
+    REPO.execute(conn, "revision_insert",
+                 (resume_id, rev, kind, payload, len(payload), datetime.datetime.utcfromtimestamp(now).isoformat(), now))
+    _compact_revisions(conn, resume_id, rev)
+
+
+def _owns_resume(conn, resume_id, user_id) -> bool:
+    return REPO.one(conn, "resume_owned", (resume_id, user_id)) is not None
+
+
+@resumes_bp.route("/api/resumes/<int:resume_id>/revisions", methods=["GET"])
+@token_required
+def list_revisions(payload, resume_id):
+    try:
+        WRITE_BUFFER.flush(resume_id)
+        conn = get_db()
+        if not _owns_resume(conn, resume_id, payload["sub"]):
+            conn.close()
+            return jsonify({"error": "Resume not found."}), 404
+        rows = REPO.all(conn, "revision_list", (resume_id,))
+        conn.close()
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    return jsonify({"revisions": [{
+        "rev": r["rev"], "kind": r["kind"], "size": r["size"], "saves": r["saves"], "createdAt": r["created_at"],
+        "savedAt": datetime.datetime.utcfromtimestamp(r["saved_at"]).isoformat(),
+    } for r in rows]})
+
+
+@resumes_bp.route("/api/resumes/<int:resume_id>/revisions/<int:rev>", methods=["GET"])
+@token_required
+def get_revision(payload, resume_id, rev):
+    try:
+        WRITE_BUFFER.flush(resume_id)
+        conn = get_db()
+        doc  = load_revision(conn, resume_id, rev) if _owns_resume(conn, resume_id, payload["sub"]) else None
+        conn.close()
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    if doc is None:
+        return jsonify({"error": "Revision not found."}), 404
+    return jsonify({"revision": {"rev": rev, **doc}})
+
+
+# ─── ATS Keyword Match (LLM-free) ─────────────────────────────────────────────
+#
+# Every save caches the resume's per-section term counts in resumes.ats_terms, so scoring
+# a job description only reads those small JSON blobs and runs a few NumPy operations.
+# Rows saved before the column existed are computed on first use and written back.
+
+ATS_MAX_JD_CHARS = int(os.getenv("ATS_MAX_JD_CHARS", "20000"))
+ATS_MAX_RESUMES  = int(os.getenv("ATS_MAX_RESUMES", "500"))
+
+
+def encode_ats_terms(data: dict) -> str:
+    return json.dumps(resume_terms(data), separators=(",", ":"))
+
+
+@resumes_bp.route("/api/resumes/ats-score", methods=["POST"])
+@token_required
+def ats_score(payload):
+    """Score the user's resumes (all, or `resumeIds`) against a pasted job description."""
+    body = request.get_json(silent=True) or {}
+    jd   = (body.get("jobDescription") or "").strip()
+    if not jd:
+        return jsonify({"error": "jobDescription is required."}), 400
+    if len(jd) > ATS_MAX_JD_CHARS:
+        return jsonify({"error": f"jobDescription is limited to {ATS_MAX_JD_CHARS} characters."}), 400
+    ids = body.get("resumeIds")
+    if ids is not None:
+        try:
+            if not isinstance(ids, list):
+                raise TypeError(ids)
+            ids = [int(i) for i in ids][:ATS_MAX_RESUMES]
+        except (TypeError, ValueError):
+            return jsonify({"error": "resumeIds must be a list of resume ids."}), 400
+        if not ids:
+            return jsonify({"keywords": [], "results": []})
+
+    # One fixed statement for every request (filtered here rather than with a variable-length IN list)
+    wanted = set(ids) if ids is not None else None
+    try:
+        WRITE_BUFFER.flush_owner(payload["sub"])
+        conn = get_db()
+        rows = []
+        for r in REPO.stream(conn, "ats_candidates", (payload["sub"],)):
+            if wanted is None or r["id"] in wanted:
+                rows.append(r)
+                if len(rows) == ATS_MAX_RESUMES:
+                    break
+        stale = [(encode_ats_terms(json.loads(r["data"])), r["id"]) for r in rows if r["ats_terms"] is None]
+        if stale:
+            REPO.many(conn, "ats_set_terms", stale)
+            conn.commit()
+        conn.close()
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    fresh = {rid: terms for terms, rid in stale}
+    resumes = [(str(r["id"]), r["name"], json.loads(r["ats_terms"] or fresh[r["id"]])) for r in rows]
+    return jsonify(score_resumes(jd, resumes))
+
+
+# ─── Dashboard Previews ───────────────────────────────────────────────────────
+#
+# Every save stores a small preview (headline, section counts, snippet) and a photo thumbnail
+# next to the document (see previews.py), so the resume list is served without the data blobs.
+# Rows saved before the columns existed are filled in by the list endpoint or `flask backfill-previews`.
+
+THUMBNAIL_SIZE      = int(os.getenv("THUMBNAIL_SIZE", "96"))
+THUMBNAIL_MAX_BYTES = int(os.getenv("THUMBNAIL_MAX_KB", "24")) * 1024
+THUMBNAILER         = Thumbnailer(THUMBNAIL_SIZE, THUMBNAIL_MAX_BYTES)
+
+
+def preview_columns(data: dict) -> tuple:
+    """(preview JSON, thumbnail) for the resumes row."""
+    return encode_preview(data), THUMBNAILER(data)
+
+
+def backfill_previews(batch_size: int = 200) -> int:
+    """Compute previews for every resume that has none. Reads through a streaming cursor and writes in batches."""
+    read_conn, write_conn = get_db(), get_db()
+    count, batch = 0, []
+    try:
+        for row in REPO.stream(read_conn, "resume_stale_previews"):
+            batch.append((*preview_columns(json.loads(row["data"])), row["id"]))
+            if len(batch) == batch_size:
+                REPO.many(write_conn, "preview_set", batch)
+                write_conn.commit()
+                count += len(batch); batch = []
+        REPO.many(write_conn, "preview_set", batch)
+        write_conn.commit()
+        count += len(batch)
+    finally:
+        read_conn.close(); write_conn.close()
+    return count
+
+
+@resumes_bp.cli.command("backfill-previews")
+def _backfill_previews_command():
+    """Compute dashboard previews for resumes saved before previews existed."""
+    init_db()
+    print(f"🖼️  Built previews for {backfill_previews()} resumes.")
+
+
 # ─── Resumes CRUD ─────────────────────────────────────────────────────────────
+#
+# Updates go through a write-behind buffer (write_buffer.py): the first save of a burst is
+# written at once, later saves within WRITE_COALESCE_SECONDS collapse into one trailing write.
+# Reads of a resume flush its buffered version first; everything left is flushed at exit.
+
+WRITE_COALESCE_SECONDS = float(os.getenv("WRITE_COALESCE_SECONDS", "5"))
+
+
+def save_resume(resume_id, user_id, value):
+    """
+    Durably write one version of a resume together with everything derived from it (search index,
+    revision, ATS terms, preview, suggestions). Returns the updated row, or None if the user has no such resume.
+    """
+    name, tpl_id, resume = value
+    data  = json.dumps(resume)
+    terms = encode_ats_terms(resume)
+    preview, thumbnail = preview_columns(resume)
+    conn  = get_db()
+    try:
+        row = REPO.write(conn, "resume_update", (name, tpl_id, data, terms, preview, thumbnail, resume_id, user_id),
+                         row_id=resume_id)
+        if row:
+            index_resume(conn, resume_id, user_id, name, resume)
+            record_revision(conn, resume_id, name, tpl_id, resume)
+        conn.commit()
+    finally:
+        conn.close()
+    if row:
+        suggestions_saved(resume_id, resume)
+    return row
 
-@app.route("/api/resumes", methods=["GET"])
+
+WRITE_BUFFER = WriteBuffer(save_resume, WRITE_COALESCE_SECONDS)
+atexit.register(WRITE_BUFFER.flush_all)
+
+
+@resumes_bp.route("/api/resumes", methods=["GET"])
 @token_required
 def list_resumes(payload):
     user_id = payload["sub"]
     try:
+        WRITE_BUFFER.flush_owner(user_id)
         conn = get_db()
-        if USE_POSTGRES:
-            cur = conn.cursor()
-            cur.execute("SELECT id,name,template_id,updated_at FROM resumes WHERE user_id=%s ORDER BY updated_at DESC", (user_id,))
-            rows = cur.fetchall(); cur.close()
-        else:
-            rows = conn.execute("SELECT id,name,template_id,updated_at FROM resumes WHERE user_id=? ORDER BY updated_at DESC", (user_id,)).fetchall()
+        rows = REPO.all(conn, "resume_list", (user_id,))
+        stale = {r["id"]: preview_columns(json.loads(r["data"])) for r in rows if r["preview"] is None}
+        if stale:
+            REPO.many(conn, "preview_set", [(*cols, rid) for rid, cols in stale.items()])
+            conn.commit()
         conn.close()
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    resumes = [{"id": str(r["id"]), "name": r["name"], "templateId": r["template_id"], "updatedAt": str(r["updated_at"])} for r in rows]
+    resumes = []
+    for r in rows:
+        preview, thumbnail = stale.get(r["id"], (r["preview"], r["thumbnail"]))
+        resumes.append({"id": str(r["id"]), "name": r["name"], "templateId": r["template_id"],
+                        "updatedAt": str(r["updated_at"]), "preview": json.loads(preview), "thumbnail": thumbnail})
     return jsonify({"resumes": resumes})
 
 
-@app.route("/api/resumes", methods=["POST"])
+@resumes_bp.route("/api/resumes", methods=["POST"])
 @token_required
 def create_resume(payload):
     user_id = payload["sub"]
     body    = request.get_json(silent=True) or {}
     name    = (body.get("name") or "Untitled Resume").strip()
     tpl_id  = (body.get("template_id") or "modern-01").strip()
-    data    = json.dumps(body.get("data") or {})
+    resume  = body.get("data") or {}
+    if not isinstance(resume, dict):
+        return jsonify({"error": "data must be a JSON object."}), 400
+    data    = json.dumps(resume)
+    terms   = encode_ats_terms(resume)
+    preview, thumbnail = preview_columns(resume)
     try:
         conn = get_db()
-        if USE_POSTGRES:
-            cur = conn.cursor()
-            cur.execute("INSERT INTO resumes (user_id,name,template_id,data) VALUES (%s,%s,%s,%s) RETURNING id,name,template_id,updated_at",
-                        (user_id, name, tpl_id, data))
-            row = cur.fetchone(); conn.commit(); cur.close()
-        else:
-            cur = conn.execute("INSERT INTO resumes (user_id,name,template_id,data) VALUES (?,?,?,?)", (user_id, name, tpl_id, data))
-            conn.commit()
-            row = conn.execute("SELECT id,name,template_id,updated_at FROM resumes WHERE id=?", (cur.lastrowid,)).fetchone()
+        row  = REPO.write(conn, "resume_insert", (user_id, name, tpl_id, data, terms, preview, thumbnail))
+        index_resume(conn, row["id"], user_id, name, resume)
+        record_revision(conn, row["id"], name, tpl_id, resume)
+        conn.commit()
         conn.close()
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+    suggestions_saved(row["id"], resume)
+    WRITE_BUFFER.wrote(row["id"], user_id)
     return jsonify({"message": "Resume saved!", "resume": {"id": str(row["id"]), "name": row["name"], "templateId": row["template_id"], "updatedAt": str(row["updated_at"])}}), 201
 
 
-@app.route("/api/resumes/<int:resume_id>", methods=["GET"])
+@resumes_bp.route("/api/resumes/<int:resume_id>", methods=["GET"])
 @token_required
 def get_resume(payload, resume_id):
     user_id = payload["sub"]
     try:
+        WRITE_BUFFER.flush(resume_id)
         conn = get_db()
-        if USE_POSTGRES:
-            cur = conn.cursor()
-            cur.execute("SELECT * FROM resumes WHERE id=%s AND user_id=%s", (resume_id, user_id))
-            row = cur.fetchone(); cur.close()
-        else:
-            row = conn.execute("SELECT * FROM resumes WHERE id=? AND user_id=?", (resume_id, user_id)).fetchone()
+        row  = REPO.one(conn, "resume_get", (resume_id, user_id))
         conn.close()
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -622,54 +1115,175 @@ def get_resume(payload, resume_id):
                                "data": json.loads(row["data"]), "updatedAt": str(row["updated_at"])}})
 
 
-@app.route("/api/resumes/<int:resume_id>", methods=["PUT"])
+@resumes_bp.route("/api/resumes/<int:resume_id>", methods=["PUT"])
 @token_required
 def update_resume(payload, resume_id):
     user_id = payload["sub"]
     body    = request.get_json(silent=True) or {}
     name    = (body.get("name") or "Untitled Resume").strip()
     tpl_id  = (body.get("template_id") or "modern-01").strip()
-    data    = json.dumps(body.get("data") or {})
-    now     = datetime.datetime.utcnow().isoformat()
+    resume  = body.get("data") or {}
+    if not isinstance(resume, dict):
+        return jsonify({"error": "data must be a JSON object."}), 400
     try:
-        conn = get_db()
-        if USE_POSTGRES:
-            cur = conn.cursor()
-            cur.execute("UPDATE resumes SET name=%s,template_id=%s,data=%s,updated_at=NOW() WHERE id=%s AND user_id=%s RETURNING id,name,template_id,updated_at",
-                        (name, tpl_id, data, resume_id, user_id))
-            row = cur.fetchone(); conn.commit(); cur.close()
-        else:
-            conn.execute("UPDATE resumes SET name=?,template_id=?,data=?,updated_at=? WHERE id=? AND user_id=?",
-                         (name, tpl_id, data, now, resume_id, user_id))
-            conn.commit()
-            row = conn.execute("SELECT id,name,template_id,updated_at FROM resumes WHERE id=?", (resume_id,)).fetchone()
-        conn.close()
+        row, buffered = WRITE_BUFFER.save(resume_id, user_id, (name, tpl_id, resume))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+    if buffered:
+        row = {"id": resume_id, "name": name, "template_id": tpl_id,
+               "updated_at": datetime.datetime.utcnow().isoformat()}
     if not row:
         return jsonify({"error": "Resume not found."}), 404
     return jsonify({"message": "Resume updated!", "resume": {"id": str(row["id"]), "name": row["name"], "templateId": row["template_id"], "updatedAt": str(row["updated_at"])}})
 
 
-@app.route("/api/resumes/<int:resume_id>", methods=["DELETE"])
+@resumes_bp.route("/api/resumes/<int:resume_id>", methods=["DELETE"])
 @token_required
 def delete_resume(payload, resume_id):
     user_id = payload["sub"]
+    WRITE_BUFFER.discard(resume_id, user_id)
     try:
         conn = get_db()
-        if USE_POSTGRES:
-            cur = conn.cursor()
-            cur.execute("DELETE FROM resumes WHERE id=%s AND user_id=%s", (resume_id, user_id))
-            conn.commit(); cur.close()
-        else:
-            conn.execute("DELETE FROM resumes WHERE id=? AND user_id=?", (resume_id, user_id))
-            conn.commit()
+        cur  = REPO.execute(conn, "resume_delete", (resume_id, user_id))
+        if cur.rowcount and not USE_POSTGRES:
+            unindex_resume(conn, resume_id)
+            # SQLite does not enforce ON DELETE CASCADE unless foreign keys are switched on
+            REPO.execute(conn, "revision_purge", (resume_id,))
+        conn.commit()
         conn.close()
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+    SUGGEST_CACHE.forget(resume_id)
     return jsonify({"message": "Resume deleted."})
 
 
+# ─── Bulk Export ──────────────────────────────────────────────────────────────
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "zip":    ("application/zip",      "zip"),
+}
+
+
+class _ZipSink:
+    """Write-only, non-seekable sink for zipfile; drained after each entry so nothing accumulates."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+def _export_record(row) -> dict:
+    return {"id": str(row["id"]), "name": row["name"], "templateId": row["template_id"],
+            "data": json.loads(row["data"]), "updatedAt": str(row["updated_at"])}
+
+
+def _iter_export_rows(conn, user_id):
+    for row in REPO.stream(conn, "resume_export", (user_id,)):
+        yield _export_record(row)
+
+
+def _export_ndjson(records):
+    for rec in records:
+        yield json.dumps(rec, ensure_ascii=False) + "\n"
+
+
+def _export_zip(records):
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for rec in records:
+            slug = re.sub(r"[^a-z0-9]+", "-", rec["name"].lower()).strip("-") or "resume"
+            zf.writestr(f"resume-{rec['id']}-{slug}.json", json.dumps(rec, ensure_ascii=False, indent=2))
+            yield sink.drain()
+    yield sink.drain()
+
+
+@resumes_bp.route("/api/resumes/export", methods=["GET"])
+@token_required
+def export_resumes(payload):
+    """
+    Stream every resume of the current user as NDJSON (default) or a ZIP of JSON files.
+    Rows are pulled through a streaming cursor, so memory stays flat regardless of account size.
+    """
+    fmt = (request.args.get("format") or "ndjson").strip().lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": "Unsupported export format. Use ndjson or zip."}), 400
+    try:
+        WRITE_BUFFER.flush_owner(payload["sub"])
+        conn = get_db()
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    records  = _iter_export_rows(conn, payload["sub"])
+    body     = _export_zip(records) if fmt == "zip" else _export_ndjson(records)
+    mimetype, ext = EXPORT_FORMATS[fmt]
+    filename = f"resumes-{datetime.date.today().isoformat()}.{ext}"
+    resp = Response(body, mimetype=mimetype,
+                    headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+    resp.call_on_close(conn.close)
+    return resp
+
+
+# ─── Server-side Rendering ────────────────────────────────────────────────────
+
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", os.path.join(os.path.dirname(__file__), "render_cache"))
+RENDER_SERVICE   = RenderService(
+    RenderCache(RENDER_CACHE_DIR, int(os.getenv("RENDER_CACHE_MAX_MB", "256")) * 1024 * 1024),
+    workers=int(os.getenv("RENDER_WORKERS", "2")),
+)
+RENDER_TIMEOUT   = float(os.getenv("RENDER_TIMEOUT", "30"))
+atexit.register(RENDER_SERVICE.shutdown)
+
+
+@render_bp.route("/api/resumes/<int:resume_id>/render", methods=["GET"])
+@token_required
+def render_resume(payload, resume_id):
+    """
+    Render a stored resume to PDF (default) or DOCX.
+    Output is cached by (content hash, template id, renderer version); the cache key doubles as ETag.
+    """
+    fmt = (request.args.get("format") or "pdf").strip().lower()
+    if fmt not in RENDER_FORMATS:
+        return jsonify({"error": "Unsupported render format. Use pdf or docx."}), 400
+    try:
+        WRITE_BUFFER.flush(resume_id)
+        conn = get_db()
+        row  = REPO.one(conn, "resume_get", (resume_id, payload["sub"]))
+        conn.close()
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    if not row:
+        return jsonify({"error": "Resume not found."}), 404
+
+    try:
+        blob, key, hit = RENDER_SERVICE.render(fmt, json.loads(row["data"]), row["template_id"], RENDER_TIMEOUT)
+    except FutureTimeout:
+        return jsonify({"error": "Rendering timed out. Please try again."}), 504
+    except Exception as e:
+        print(f"[Render] {fmt} render failed for resume {resume_id}: {e}")
+        return jsonify({"error": "Failed to render resume"}), 500
+
+    slug = re.sub(r"[^a-z0-9]+", "-", row["name"].lower()).strip("-") or "resume"
+    resp = Response(blob, mimetype=RENDER_FORMATS[fmt], headers={
+        "Content-Disposition": f'attachment; filename="{slug}.{fmt}"',
+        "X-Render-Cache":      "hit" if hit else "miss",
+        "Cache-Control":       "private, no-cache",
+    })
+    resp.set_etag(key)
+    return resp.make_conditional(request)
+
+
 # ─── AI Enhance Proxy ─────────────────────────────────────────────────────────
 
 GEMINI_API_KEY  = os.getenv("GEMINI_API_KEY", "")
@@ -677,6 +1291,58 @@ DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY", "")
 OPENAI_API_KEY  = os.getenv("OPENAI_API_KEY", "")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 
+# Overridable so load tests can point every provider at loadtest/fake_llm.py
+GROQ_BASE_URL     = os.getenv("GROQ_BASE_URL", "https://api.groq.com")
+GEMINI_BASE_URL   = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com")
+DEEPSEEK_BASE_URL = os.getenv("DEEPSEEK_BASE_URL", "https://api.deepseek.com")
+OPENAI_BASE_URL   = os.getenv("OPENAI_BASE_URL", "https://api.openai.com")
+
+# Every AI request gets a deadline (the frontend gives up on /api/ai/enhance after 15 s); a client can
+# send its own in X-Request-Deadline-Ms. The registry splits what is left across fallback attempts,
+# uses it as each call's timeout and answers 504 once it runs out instead of trying the next provider.
+AI_DEADLINE_SECONDS     = float(os.getenv("AI_DEADLINE_SECONDS", "14"))
+AI_PARSE_DEADLINE       = float(os.getenv("AI_PARSE_DEADLINE_SECONDS", "30"))  # uploads have no client-side timeout
+AI_CALL_TIMEOUT         = float(os.getenv("AI_CALL_TIMEOUT", "12"))
+AI_MIN_ATTEMPT_SECONDS  = float(os.getenv("AI_MIN_ATTEMPT_SECONDS", "2"))
+DEADLINE_HEADER         = "X-Request-Deadline-Ms"
+DEADLINE_HEADROOM       = 0.25  # seconds kept back from a client deadline for sending the response
+
+
+def _disconnect_probe(environ):
+    """() -> True once the client has closed its connection, or None when the server does not expose the socket."""
+    sock  = environ.get("werkzeug.socket") or environ.get("gunicorn.socket")
+    flags = getattr(socket, "MSG_PEEK", 0) | getattr(socket, "MSG_DONTWAIT", 0)
+    if sock is None or not hasattr(socket, "MSG_DONTWAIT"):
+        return None
+
+    def disconnected() -> bool:
+        try:
+            return sock.recv(1, flags) == b""  # orderly shutdown from the client
+        except (BlockingIOError, InterruptedError, ValueError):  # nothing to read yet / TLS socket
+            return False
+        except OSError:
+            return True
+    return disconnected
+
+
+def request_deadline(default: float = AI_DEADLINE_SECONDS) -> Deadline:
+    """The endpoint's budget, or less when the client's X-Request-Deadline-Ms says it will give up sooner."""
+    seconds = default
+    header  = request.headers.get(DEADLINE_HEADER)
+    if header:
+        try:
+            seconds = min(int(header) / 1000 - DEADLINE_HEADROOM, default)
+        except ValueError:
+            pass
+    return Deadline(max(seconds, 0.0), _disconnect_probe(request.environ))
+
+
+def _deadline_exceeded(e: Exception, **body):
+    if isinstance(e, ClientDisconnected):
+        print(f"[AI] {request.path}: client disconnected, remaining attempts cancelled")
+    return jsonify({"error": "The AI providers did not answer in time.", **body}), 504
+
+
 MODE_PROMPTS = {
     "improve":    "You are a professional resume writer. Improve the grammar, clarity, and professional tone of this resume text. Keep the same facts, just make it sound more polished and impactful. Return ONLY the improved text, no explanations.",
     "shorten":    "You are a professional resume writer. Shorten this resume text to be more concise and impactful. Remove unnecessary words while keeping the key achievements and metrics. Return ONLY the shortened text as bullet points starting with action verbs.",
@@ -686,7 +1352,7 @@ MODE_PROMPTS = {
 }
 
 
-def _post_json(url: str, headers: dict, body: dict, timeout: int = 12) -> dict:
+def _post_json(url: str, headers: dict, body: dict, timeout: float = AI_CALL_TIMEOUT) -> dict:
     """Make a JSON POST request using stdlib urllib (no dependencies)."""
     data = json.dumps(body).encode("utf-8")
     req  = urllib.request.Request(url, data=data, headers=headers, method="POST")
@@ -694,94 +1360,82 @@ def _post_json(url: str, headers: dict, body: dict, timeout: int = 12) -> dict:
         return json.loads(resp.read().decode("utf-8"))
 
 
-def _try_gemini(text: str, mode: str) -> str | None:
-    if not GEMINI_API_KEY:
-        return None
-    try:
-        prompt = f"{MODE_PROMPTS.get(mode, MODE_PROMPTS['improve'])}\n\nResume text:\n{text}"
-        url    = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={GEMINI_API_KEY}"
-        body   = {"contents": [{"parts": [{"text": prompt}]}], "generationConfig": {"temperature": 0.7, "maxOutputTokens": 1024}}
-        resp   = _post_json(url, {"Content-Type": "application/json"}, body)
-        return resp["candidates"][0]["content"]["parts"][0]["text"].strip()
-    except Exception as exc:
-        if "429" in str(exc):
-            print(f"[AI] Gemini rate limit exceeded (429). Try again in a minute or add a paid key.")
-        else:
-            print(f"[AI] Gemini failed: {exc}")
-        return None
-
-
-def _try_deepseek(text: str, mode: str) -> str | None:
-    if not DEEPSEEK_API_KEY:
-        return None
-    try:
-        prompt = f"{MODE_PROMPTS.get(mode, MODE_PROMPTS['improve'])}\n\nResume text:\n{text}"
-        body   = {
-            "model":    "deepseek-chat",
+def _complete_groq(prompt: str, temperature: float = 0.7, max_tokens: int = 1024,
+                   timeout: float = AI_CALL_TIMEOUT) -> str:
+    """GROQ API — fast and free."""
+    # SDK-level retries would hide 429s/5xx from the provider registry's circuit breaker
+    from groq import Groq  # heavy SDK — imported on first use
+    client = Groq(api_key=GROQ_API_KEY, base_url=GROQ_BASE_URL, max_retries=0)
+    message = client.chat.completions.create(
+        model="llama-3.3-70b-versatile",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=temperature,
+        max_tokens=max_tokens,
+        timeout=timeout,
+    )
+    return message.choices[0].message.content
+
+
+def _complete_gemini(prompt: str, temperature: float = 0.7, max_tokens: int = 1024,
+                     timeout: float = AI_CALL_TIMEOUT) -> str:
+    url  = f"{GEMINI_BASE_URL}/v1beta/models/gemini-2.0-flash:generateContent?key={GEMINI_API_KEY}"
+    body = {"contents": [{"parts": [{"text": prompt}]}], "generationConfig": {"temperature": temperature, "maxOutputTokens": max_tokens}}
+    resp = _post_json(url, {"Content-Type": "application/json"}, body, timeout)
+    return resp["candidates"][0]["content"]["parts"][0]["text"]
+
+
+def _complete_chat(url: str, api_key: str, model: str):
+    """Completion function for an OpenAI-compatible chat endpoint (DeepSeek, OpenAI)."""
+    def complete(prompt: str, temperature: float = 0.7, max_tokens: int = 1024,
+                 timeout: float = AI_CALL_TIMEOUT) -> str:
+        body = {
+            "model":    model,
             "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.7, "max_tokens": 1024,
+            "temperature": temperature, "max_tokens": max_tokens,
         }
-        resp = _post_json(
-            "https://api.deepseek.com/v1/chat/completions",
-            {"Content-Type": "application/json", "Authorization": f"Bearer {DEEPSEEK_API_KEY}"},
-            body,
-        )
-        return resp["choices"][0]["message"]["content"].strip()
-    except Exception as exc:
-        print(f"[AI] DeepSeek failed: {exc}")
-        return None
-
-
-def _try_openai(text: str, mode: str) -> str | None:
-    if not OPENAI_API_KEY:
-        return None
-    try:
-        prompt = f"{MODE_PROMPTS.get(mode, MODE_PROMPTS['improve'])}\n\nResume text:\n{text}"
-        body   = {
-            "model":    "gpt-3.5-turbo",
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.7, "max_tokens": 1024,
-        }
-        resp = _post_json(
-            "https://api.openai.com/v1/chat/completions",
-            {"Content-Type": "application/json", "Authorization": f"Bearer {OPENAI_API_KEY}"},
-            body,
-        )
-        return resp["choices"][0]["message"]["content"].strip()
-    except Exception as exc:
-        print(f"[AI] OpenAI failed: {exc}")
-        return None
+        resp = _post_json(url, {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}, body, timeout)
+        return resp["choices"][0]["message"]["content"]
+    return complete
+
+
+# Registration order is the initial preference; after that, observed latency and errors decide.
+PROVIDERS = ProviderRegistry(
+    failure_threshold=int(os.getenv("AI_BREAKER_FAILURES", "3")),
+    cooldown=float(os.getenv("AI_BREAKER_COOLDOWN", "30")),
+    call_timeout=AI_CALL_TIMEOUT,
+    min_attempt=AI_MIN_ATTEMPT_SECONDS,
+)
+PROVIDERS.register("groq",     _complete_groq,   lambda: GROQ_API_KEY)
+PROVIDERS.register("gemini",   _complete_gemini, lambda: GEMINI_API_KEY)
+PROVIDERS.register("deepseek", _complete_chat(f"{DEEPSEEK_BASE_URL}/v1/chat/completions", DEEPSEEK_API_KEY, "deepseek-chat"),
+                   lambda: DEEPSEEK_API_KEY)
+PROVIDERS.register("openai",   _complete_chat(f"{OPENAI_BASE_URL}/v1/chat/completions", OPENAI_API_KEY, "gpt-3.5-turbo"),
+                   lambda: OPENAI_API_KEY)
+
+EXTRACT_PROVIDERS = ("groq", "gemini")
+SUGGEST_PROVIDERS = ("groq", "gemini", "openai")
 
+# ─── Resume Parsing/Extraction ────────────────────────────────────────────────
 
-def _try_groq(text: str, mode: str) -> str | None:
-    """Try GROQ API — fast and free alternative for AI enhancement."""
-    if not GROQ_API_KEY:
-        return None
-    try:
-        prompt = f"{MODE_PROMPTS.get(mode, MODE_PROMPTS['improve'])}\n\nText to enhance:\n{text}"
-        
-        client = Groq(api_key=GROQ_API_KEY)
-        message = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=1024
-        )
-        
-        return message.choices[0].message.content.strip()
-    except Exception as exc:
-        print(f"[AI] GROQ failed: {exc}")
-        return None
+# Uploads spool in memory up to UPLOAD_SPOOL_KB and spill to a temp file beyond it (see uploads.py).
+# MAX_CONTENT_LENGTH is set from MAX_UPLOAD_MB, so oversized requests get a 413 before the body is read.
+MAX_UPLOAD_BYTES     = int(float(os.getenv("MAX_UPLOAD_MB", "10")) * 1024 * 1024)
+UPLOAD_SPOOL_BYTES   = int(os.getenv("UPLOAD_SPOOL_KB", "256")) * 1024
+UPLOAD_FORM_OVERHEAD = 64 * 1024  # multipart boundaries and headers
+DOCX_MAX_XML_BYTES   = int(os.getenv("DOCX_MAX_XML_MB", "50")) * 1024 * 1024
+UPLOAD_KINDS         = {"pdf": "PDF", "docx": "DOCX", "txt": "TXT"}
 
-# ─── Resume Parsing/Extraction ────────────────────────────────────────────────
 
-@app.route("/api/ai/parse-resume", methods=["POST"])
+@ai_bp.route("/api/ai/parse-resume", methods=["POST"])
 def parse_resume():
     """
-    Extract resume data from uploaded file using GROQ AI first (free, unlimited),
-    then Gemini if needed, fallback to manual extraction.
+    Extract resume data from uploaded file using the AI providers (GROQ / Gemini, ordered
+    by observed latency and health), falling back to manual extraction.
     Returns: {result: resume_data, method: "ai" | "manual"}
     """
+    deadline = request_deadline(AI_PARSE_DEADLINE)
+    if request.content_length is not None and request.content_length > MAX_UPLOAD_BYTES + UPLOAD_FORM_OVERHEAD:
+        return _upload_too_large()
     if 'file' not in request.files:
         return jsonify({"error": "No file uploaded"}), 400
     
@@ -789,43 +1443,47 @@ def parse_resume():
     if not file.filename:
         return jsonify({"error": "No file selected"}), 400
     
-    # Extract text from file
-    text = ""
+    # Extract text from file — the type comes from its magic bytes, not the extension
+    text, headings = "", None
     try:
-        content = file.read()
-        ext = file.filename.split('.')[-1].lower()
-        
-        if ext == 'pdf':
-            text = extract_pdf_text(io.BytesIO(content))
-        elif ext == 'docx':
-            doc = docx.Document(io.BytesIO(content))
-            text = "\n".join([p.text for p in doc.paragraphs if p.text.strip()])
-        elif ext == 'txt':
-            text = content.decode('utf-8', errors='ignore')
-        else:
-            return jsonify({"error": "Unsupported file format. Please upload PDF, DOCX, or TXT."}), 400
+        with open_view(file.stream) as view:
+            kind = sniff_kind(view, DOCX_MAX_XML_BYTES)
+            ext  = file.filename.rsplit('.', 1)[-1].lower()
+            if kind is None:
+                return jsonify({"error": "Unsupported file format. Please upload PDF, DOCX, or TXT."}), 400
+            if kind != ext:
+                print(f"[Parse] {file.filename!r} is actually {UPLOAD_KINDS[kind]}")
+
+            if kind == 'pdf':
+                from pdfminer.high_level import extract_text as extract_pdf_text
+                text = extract_pdf_text(view)
+            elif kind == 'docx':
+                # streamed from word/document.xml: paragraphs and table cells, plus heading-style hints
+                text, headings = extract_docx(view, DOCX_MAX_XML_BYTES)
+            else:
+                text = read_text(view)
     
     except Exception as e:
         print(f"[Parse] Error extracting text: {e}")
         return jsonify({"error": "Failed to read file"}), 500
+    finally:
+        file.close()
     
-    if not text.strip():
+    text = normalize_resume_text(text)
+    if not text:
         return jsonify({"error": "File is empty or unreadable"}), 400
     
-    # Try GROQ extraction first (free, unlimited)
-    print(f"[Parse] Attempting GROQ extraction...")
-    result = extract_with_groq(text)
-    
-    if result:
-        print(f"[Parse] Success with GROQ AI")
-        return jsonify({"result": result, "method": "ai", "success": True})
-    
-    # Fallback to Gemini if GROQ fails
-    print(f"[Parse] GROQ failed, trying Gemini extraction...")
-    result = extract_with_gemini(text)
+    # AI extraction: fastest healthy provider first (GROQ / Gemini), within the request's deadline
+    try:
+        result, provider = extract_with_ai(text, headings, deadline)
+    except ClientDisconnected as e:
+        return _deadline_exceeded(e, success=False)
+    except DeadlineExceeded as e:
+        print(f"[Parse] {e}")
+        result = None  # manual extraction is quick, so it still answers
     
     if result:
-        print(f"[Parse] Success with Gemini AI")
+        print(f"[Parse] Success with {provider}")
         return jsonify({"result": result, "method": "ai", "success": True})
     
     # Final fallback to manual extraction
@@ -838,7 +1496,7 @@ def parse_resume():
         print(f"[Parse] Manual extraction failed: {e}")
         return jsonify({"error": "Failed to extract resume data", "method": "manual", "success": False}), 500
 
-@app.route("/api/ai/enhance", methods=["POST"])
+@ai_bp.route("/api/ai/enhance", methods=["POST"])
 def ai_enhance():
     """Public AI proxy — no auth required so guests can also use AI."""
     data = request.get_json(silent=True) or {}
@@ -852,8 +1510,12 @@ def ai_enhance():
     if len(text) > 8000:
         return jsonify({"error": "text too long (max 8000 chars)"}), 400
 
-    # Try AI providers in order: GROQ (fast/free) → Gemini (free) → DeepSeek → OpenAI
-    result = _try_groq(text, mode) or _try_gemini(text, mode) or _try_deepseek(text, mode) or _try_openai(text, mode)
+    # Providers are tried cheapest-first by expected latency; open circuits are skipped
+    prompt = f"{MODE_PROMPTS[mode]}\n\nResume text:\n{text}"
+    try:
+        result, _ = PROVIDERS.complete(prompt, deadline=request_deadline(), temperature=0.7, max_tokens=1024)
+    except DeadlineExceeded as e:
+        return _deadline_exceeded(e, result=None, provider="none")
 
     if result:
         return jsonify({"result": result, "provider": "ai"})
@@ -862,19 +1524,33 @@ def ai_enhance():
 
 # ─── AI Resume Suggestions ────────────────────────────────────────────────────
 
-@app.route("/api/ai/suggest", methods=["POST"])
-def ai_suggest():
-    """
-    Takes a parsed resume JSON and returns AI-powered improvement suggestions.
-    No auth required — works for all users.
-    """
-    data   = request.get_json(silent=True) or {}
-    resume = data.get("resume") or {}
+SUGGEST_CACHE_SIZE       = int(os.getenv("SUGGEST_CACHE_SIZE", "512"))
+SUGGEST_CACHE_TTL        = float(os.getenv("SUGGEST_CACHE_TTL", "86400"))
+SUGGEST_PRECOMPUTE       = os.getenv("SUGGEST_PRECOMPUTE", "false").lower() in ("1", "true", "yes")
+SUGGEST_PRECOMPUTE_DELAY = float(os.getenv("SUGGEST_PRECOMPUTE_DELAY", "20"))
 
-    if not resume:
-        return jsonify({"error": "resume data is required"}), 400
+SUGGEST_CACHE = SuggestionCache(SUGGEST_CACHE_SIZE, SUGGEST_CACHE_TTL, SUGGEST_PRECOMPUTE_DELAY)
+
+SUGGEST_PROMPT = """You are an expert resume coach and career counselor. Analyze the following resume and provide exactly 5 concise, actionable improvement suggestions.
 
-    # Build a compact text summary of the resume to send to AI
+Resume:
+{resume_text}
+
+Instructions:
+- Each suggestion must be specific and immediately actionable.
+- Cover areas like: weak bullet points, missing quantification, ATS keywords, summary quality, gaps, or missing sections.
+- Format your response as a valid JSON array of exactly 5 objects, each with these fields:
+  - "category": one of "Summary", "Experience", "Skills", "ATS", "Format", "Projects", "Education", "Missing"
+  - "title": short title (max 6 words)
+  - "suggestion": actionable advice (1-2 sentences, specific)
+  - "priority": "high", "medium", or "low"
+
+Return ONLY the JSON array, no other text, no markdown fences.
+"""
+
+
+def suggest_summary(resume: dict) -> str:
+    """The compact text summary of a resume that is sent to the AI (and hashed as the cache key)."""
     lines = []
     pi = resume.get("personalInfo", {})
     if pi.get("fullName"):  lines.append(f"Name: {pi['fullName']}")
@@ -895,93 +1571,58 @@ def ai_suggest():
     proj_list = resume.get("projects", [])
     for p in proj_list[:2]:
         lines.append(f"Project: {p.get('name','')} — {p.get('description','')[:150]}")
+    return "\n".join(lines)
 
-    resume_text = "\n".join(lines)
 
-    prompt = f"""You are an expert resume coach and career counselor. Analyze the following resume and provide exactly 5 concise, actionable improvement suggestions.
+def generate_suggestions(resume_text: str, deadline: Deadline | None = None):
+    """Ask the providers for suggestions. Returns the parsed list, or None when no provider answered."""
+    prompt = SUGGEST_PROMPT.format(resume_text=resume_text)
+    raw, _ = PROVIDERS.complete(prompt, names=SUGGEST_PROVIDERS, label="Suggest", deadline=deadline,
+                                temperature=0.4, max_tokens=1024)
+    if not raw:
+        return None
 
-Resume:
-{resume_text}
+    # Clean markdown fences
+    raw = re.sub(r"```(json)?", "", raw).strip()
+    start = raw.find("[")
+    end   = raw.rfind("]")
+    if start != -1 and end != -1:
+        raw = raw[start:end+1]
+    return json.loads(raw)
 
-Instructions:
-- Each suggestion must be specific and immediately actionable.
-- Cover areas like: weak bullet points, missing quantification, ATS keywords, summary quality, gaps, or missing sections.
-- Format your response as a valid JSON array of exactly 5 objects, each with these fields:
-  - "category": one of "Summary", "Experience", "Skills", "ATS", "Format", "Projects", "Education", "Missing"
-  - "title": short title (max 6 words)
-  - "suggestion": actionable advice (1-2 sentences, specific)
-  - "priority": "high", "medium", or "low"
 
-Return ONLY the JSON array, no other text, no markdown fences.
-"""
+def suggestions_saved(resume_id, resume: dict):
+    """Called after a resume is saved: invalidate its old suggestions and optionally precompute new ones."""
+    text = suggest_summary(resume)
+    SUGGEST_CACHE.saved(resume_id, summary_key(text),
+                        (lambda: generate_suggestions(text)) if SUGGEST_PRECOMPUTE and text else None)
 
-    def _suggest_groq():
-        if not GROQ_API_KEY: return None
-        body = {
-            "model": "mixtral-8x7b-32768",
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.4,
-            "max_tokens": 1024,
-        }
-        resp = _post_json(
-            "https://api.groq.com/openai/v1/chat/completions",
-            {"Content-Type": "application/json", "Authorization": f"Bearer {GROQ_API_KEY}"},
-            body,
-        )
-        return resp["choices"][0]["message"]["content"].strip()
-
-    def _suggest_gemini():
-        if not GEMINI_API_KEY: return None
-        url  = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={GEMINI_API_KEY}"
-        body = {"contents": [{"parts": [{"text": prompt}]}], "generationConfig": {"temperature": 0.4, "maxOutputTokens": 1024}}
-        resp = _post_json(url, {"Content-Type": "application/json"}, body)
-        return resp["candidates"][0]["content"]["parts"][0]["text"].strip()
-
-    def _suggest_openai():
-        if not OPENAI_API_KEY: return None
-        body = {
-            "model": "gpt-3.5-turbo",
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.4, "max_tokens": 1024,
-        }
-        resp = _post_json(
-            "https://api.openai.com/v1/chat/completions",
-            {"Content-Type": "application/json", "Authorization": f"Bearer {OPENAI_API_KEY}"},
-            body,
-        )
-        return resp["choices"][0]["message"]["content"].strip()
 
-    try:
-        raw = None
-        # Try GROQ first (fastest + free)
-        try:
-            raw = _suggest_groq()
-        except Exception as groq_err:
-            print(f"[Suggest] GROQ failed: {groq_err}")
-            # Fallback to Gemini
-            try:
-                raw = _suggest_gemini()
-            except Exception as ge:
-                print(f"[Suggest] Gemini failed: {ge}")
-                # Final fallback to OpenAI
-                try:
-                    raw = _suggest_openai()
-                except Exception as oe:
-                    print(f"[Suggest] OpenAI also failed: {oe}")
+@ai_bp.route("/api/ai/suggest", methods=["POST"])
+def ai_suggest():
+    """
+    Takes a parsed resume JSON and returns AI-powered improvement suggestions.
+    No auth required — works for all users. Results are cached by the hash of the resume summary.
+    """
+    data   = request.get_json(silent=True) or {}
+    resume = data.get("resume") or {}
 
-        if not raw:
-            return jsonify({"suggestions": [], "provider": "none"}), 503
+    if not resume:
+        return jsonify({"error": "resume data is required"}), 400
 
-        # Clean markdown fences
-        raw = re.sub(r"```(json)?", "", raw).strip()
-        start = raw.find("[")
-        end   = raw.rfind("]")
-        if start != -1 and end != -1:
-            raw = raw[start:end+1]
+    resume_text = suggest_summary(resume)
+    deadline    = request_deadline()
 
-        suggestions = json.loads(raw)
-        return jsonify({"suggestions": suggestions, "provider": "ai"})
+    try:
+        suggestions, hit = SUGGEST_CACHE.get_or_compute(summary_key(resume_text),
+                                                        lambda: generate_suggestions(resume_text, deadline),
+                                                        timeout=deadline.remaining())
+        if suggestions is None:
+            return jsonify({"suggestions": [], "provider": "none"}), 503
+        return jsonify({"suggestions": suggestions, "provider": "ai", "cached": hit})
 
+    except (DeadlineExceeded, FutureTimeout) as e:  # FutureTimeout: waited on another request's call
+        return _deadline_exceeded(e, suggestions=[], provider="none")
     except Exception as e:
         print(f"[Suggest] Failed: {e}")
         return jsonify({"suggestions": [], "provider": "error"}), 500
@@ -991,7 +1632,7 @@ Return ONLY the JSON array, no other text, no markdown fences.
 
 # ─── Skill Suggestions via GROQ ──────────────────────────────────────────────
 
-@app.route("/api/ai/skill-suggestions", methods=["POST"])
+@ai_bp.route("/api/ai/skill-suggestions", methods=["POST"])
 def ai_skill_suggestions():
     """
     Generate skill suggestions based on partial input.
@@ -1022,7 +1663,8 @@ Example format:
 
     try:
         # Use GROQ for fast skill suggestions
-        result = _try_groq(input_text, "improve", prompt)
+        result, _ = PROVIDERS.complete(prompt, names=("groq",), label="Skills", deadline=request_deadline(),
+                                       temperature=0.4, max_tokens=256)
         if result:
             # Extract JSON array from result
             start = result.find("[")
@@ -1039,14 +1681,38 @@ Example format:
         # Fallback: return empty if GROQ fails
         return jsonify({"suggestions": [], "provider": "none"})
     
+    except DeadlineExceeded as e:
+        return _deadline_exceeded(e, suggestions=[], provider="none")
     except Exception as e:
         print(f"[Skills] Suggestions failed: {e}")
         return jsonify({"suggestions": [], "provider": "error"}), 500
 
 
+# ─── Resume Lint (LLM-free) ───────────────────────────────────────────────────
+
+LINT_ENGINE    = LintEngine()  # rules are compiled into one automaton at startup
+LINT_MAX_BATCH = 200
+
+
+@tools_bp.route("/api/lint", methods=["POST"])
+def lint_resumes():
+    """
+    Span-level writing feedback (misspellings, weak words/verbs, stock phrases) for a whole
+    resume ({"resume": {...}}) or a batch ({"resumes": [...]}). No auth, no AI provider.
+    """
+    data = request.get_json(silent=True) or {}
+    if isinstance(data.get("resumes"), list):
+        if len(data["resumes"]) > LINT_MAX_BATCH:
+            return jsonify({"error": f"too many resumes (max {LINT_MAX_BATCH})"}), 400
+        return jsonify({"results": LINT_ENGINE.lint_batch(data["resumes"])})
+    if isinstance(data.get("resume"), dict):
+        return jsonify(LINT_ENGINE.lint_document(data["resume"]))
+    return jsonify({"error": "resume or resumes is required"}), 400
+
+
 # ─── University / College Autocomplete ────────────────────────────────────────
 
-@app.route("/api/universities", methods=["GET"])
+@tools_bp.route("/api/universities", methods=["GET"])
 def universities():
     """Proxy for https://universities.hipolabs.com — no auth needed."""
     query = request.args.get("q", "").strip()
@@ -1064,6 +1730,37 @@ def universities():
         return jsonify({"universities": []})
 
 
+# ─── App factory ──────────────────────────────────────────────────────────────
+#
+# Heavy dependencies — pdfminer, python-docx, the Groq SDK, NumPy and psycopg2 — are imported
+# on first use, so a worker that only serves CRUD never pays for them at boot.
+# bench/import_time.py guards the cold-start budget.
+
+def create_app(route_groups=None) -> Flask:
+    """
+    Build the app serving `route_groups` — a list of BLUEPRINTS names, or the comma-separated
+    ROUTE_GROUPS env var (default "all"), e.g. ROUTE_GROUPS=auth,resumes for a CRUD-only worker.
+    """
+    if route_groups is None:
+        route_groups = [g.strip() for g in os.getenv("ROUTE_GROUPS", "all").split(",") if g.strip()]
+    if "all" in route_groups:
+        route_groups = list(BLUEPRINTS)
+    unknown = set(route_groups) - set(BLUEPRINTS)
+    if unknown:
+        raise ValueError(f"Unknown route group(s) {', '.join(sorted(unknown))}; choose from {', '.join(BLUEPRINTS)}.")
+
+    flask_app = Flask(__name__)
+    flask_app.request_class = spooled_request_class(UPLOAD_SPOOL_BYTES)
+    flask_app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES + UPLOAD_FORM_OVERHEAD
+    flask_app.register_blueprint(core_bp)
+    for name in route_groups:
+        flask_app.register_blueprint(BLUEPRINTS[name])
+    return flask_app
+
+
+app = create_app()
+
+
 # ─── Entry ────────────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
@@ -0,0 +1,129 @@
+"""
+Local ATS keyword matching — no AI provider involved.
+
+On every write, each resume's text is reduced to per-section term counts
+(`resume_terms`) that are cached in the database. Scoring a job description then
+only tokenises the JD, builds a vocabulary from its keywords and does a handful
+of NumPy matrix operations over the cached term vectors of all candidate resumes.
+"""
+import re
+import math
+
+SECTIONS = ("title", "summary", "experience", "skills", "projects", "education")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below between both
+but by can could did do does doing down during each etc few for from further had has have having he her here hers
+him his how i if in into is it its itself just me more most my no nor not now of off on once only or other our ours
+out over own per same she should so some such than that the their theirs them then there these they this those
+through to too under until up us very via was we were what when where which while who whom why will with would you
+your yours
+ability able across work working works years year experience experienced strong excellent good great plus preferred
+required requirements responsibilities responsible including include includes within using use must role team teams
+candidate candidates job position company join looking seeking opportunity ideal knowledge understanding skills skill
+well new related relevant equivalent degree highly proven demonstrated familiarity familiar hands day days e.g i.e
+bonus nice build building own owning help helping get make like etc senior junior
+""".split())
+
+_TOKEN_RE  = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*")
+_CLAUSE_RE = re.compile(r"[,;:!?()\[\]\n•|]|\.(?=\s|$)")
+
+
+def tokenize(text: str) -> list:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if not t.isdigit()]
+
+
+def term_counts(text: str) -> dict:
+    """Unigram and bigram counts, ignoring stopwords (bigrams never span a stopword or punctuation)."""
+    counts = {}
+    for clause in _CLAUSE_RE.split((text or "").lower()):
+        prev = None
+        for tok in tokenize(clause):
+            if tok in STOPWORDS or (len(tok) < 2 and tok not in ("c", "r")):
+                prev = None
+                continue
+            counts[tok] = counts.get(tok, 0) + 1
+            if prev:
+                bigram = f"{prev} {tok}"
+                counts[bigram] = counts.get(bigram, 0) + 1
+            prev = tok
+    return counts
+
+
+def resume_terms(data: dict) -> dict:
+    """Per-section term counts for a resume — the value cached alongside each row."""
+    def join(items, keys):
+        return "\n".join(" ".join(str(i.get(k) or "") for k in keys) for i in items or [] if isinstance(i, dict))
+    texts = {
+        "title":      (data.get("personalInfo") or {}).get("title") or "",
+        "summary":    data.get("summary") or "",
+        "experience": join(data.get("experience"), ("position", "company", "description")),
+        "projects":   join(data.get("projects"), ("name", "role", "description")),
+        "education":  join(data.get("education"), ("degree", "field", "school")),
+    }
+    terms = {sec: term_counts(text) for sec, text in texts.items() if text.strip()}
+    # counted per skill so multi-word skills form bigrams but two adjacent skills never do
+    skills = {}
+    for skill in data.get("skills") or []:
+        for term, c in term_counts(skill if isinstance(skill, str) else "").items():
+            skills[term] = skills.get(term, 0) + c
+    if skills:
+        terms["skills"] = skills
+    return terms
+
+
+def job_keywords(job_description: str, limit: int) -> dict:
+    """The JD's most frequent keywords → raw term frequency."""
+    counts = term_counts(job_description)
+    ranked = sorted(counts.items(), key=lambda kv: (-kv[1] * (1.5 if " " in kv[0] else 1.0), kv[0]))
+    return dict(ranked[:limit])
+
+
+def score_resumes(job_description: str, resumes: list, max_keywords: int = 60, max_missing: int = 15) -> dict:
+    """
+    `resumes` is [(id, name, terms_by_section), ...]. Returns keywords plus one result per resume:
+    score (0-100), matched / missing keywords and weighted keyword coverage per section.
+    """
+    import numpy as np  # only scoring needs NumPy; resume_terms runs on every save without it
+
+    jd = job_keywords(job_description, max_keywords)
+    if not jd or not resumes:
+        return {"keywords": list(jd), "results": []}
+    vocab = {term: i for i, term in enumerate(jd)}
+    n, v  = len(resumes), len(vocab)
+
+    # sections × resumes × vocabulary
+    counts = np.zeros((len(SECTIONS), n, v), dtype=np.float32)
+    for r, (_, _, terms) in enumerate(resumes):
+        for s, section in enumerate(SECTIONS):
+            for term, c in (terms.get(section) or {}).items():
+                col = vocab.get(term)
+                if col is not None:
+                    counts[s, r, col] = c
+    totals = counts.sum(axis=0)                                  # resumes × vocab
+    df     = (totals > 0).sum(axis=0)
+    idf    = np.log((1 + n) / (1 + df)) + 1.0                    # smoothed, as in scikit-learn
+    jd_tf  = np.array([1 + math.log(c) for c in jd.values()], dtype=np.float32)
+    jd_w   = jd_tf * idf                                         # keyword importance
+    jd_w  /= jd_w.sum()
+
+    res_vec = np.where(totals > 0, 1 + np.log(np.maximum(totals, 1)), 0) * idf
+    cosine  = (res_vec @ jd_w) / (np.linalg.norm(res_vec, axis=1) * np.linalg.norm(jd_w) + 1e-9)
+    present = totals > 0
+    coverage = present @ jd_w                                    # weighted share of JD keywords found
+    section_cov = (counts > 0) @ jd_w                            # sections × resumes
+    scores  = 100 * (0.7 * coverage + 0.3 * cosine)
+
+    terms  = list(jd)
+    order  = np.argsort(-jd_w)
+    results = []
+    for r, (rid, name, _) in enumerate(resumes):
+        results.append({
+            "id": rid, "name": name, "score": round(float(scores[r]), 1),
+            "coverage": round(float(coverage[r]), 3),
+            "matched": [terms[i] for i in order if present[r, i]],
+            "missing": [terms[i] for i in order if not present[r, i]][:max_missing],
+            "sections": {sec: round(float(section_cov[s, r]), 3) for s, sec in enumerate(SECTIONS)},
+        })
+    results.sort(key=lambda x: -x["score"])
+    return {"keywords": terms, "results": results}
@@ -0,0 +1,162 @@
+"""
+Per-operation latency of the data-access layer on SQLite.
+
+Runs the hot resume operations against a throwaway database twice: the way
+the routes used to do it (a fresh connection per request, a follow-up SELECT
+after every write, one statement per row) and through repository.py (pooled
+connections with a warm statement cache, INSERT/UPDATE … RETURNING,
+executemany for batches). Prints p50/p95 in microseconds per operation.
+
+Usage:
+    python bench/db_ops.py                 # 2000 iterations per operation
+    python bench/db_ops.py --iterations 500 --batch 100
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.pop("DATABASE_URL", None)  # always benchmark the SQLite backend
+import app  # noqa: E402
+
+RESUME  = {"summary": "Backend engineer", "skills": ["Python", "SQL"], "experience": []}
+DATA    = json.dumps(RESUME)
+PREVIEW = app.encode_preview(RESUME)
+
+
+def legacy_connect():
+    conn = sqlite3.connect(app.DB_PATH)
+    conn.row_factory = lambda cursor, row: {c[0]: row[i] for i, c in enumerate(cursor.description)}
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def legacy_ops(user_id: int, list_user: int, batch: int) -> dict:
+    def create():
+        conn = legacy_connect()
+        cur = conn.execute("INSERT INTO resumes (user_id,name,template_id,data) VALUES (?,?,?,?)",
+                           (user_id, "Bench", "modern-01", DATA))
+        conn.commit()
+        conn.execute("SELECT id,name,template_id,updated_at FROM resumes WHERE id=?", (cur.lastrowid,)).fetchone()
+        conn.close()
+        return cur.lastrowid
+
+    rid = create()
+
+    def update():
+        conn = legacy_connect()
+        cur = conn.execute("UPDATE resumes SET name=?,data=?,updated_at=? WHERE id=? AND user_id=?",
+                           ("Bench", DATA, time.time(), rid, user_id))
+        conn.commit()
+        if cur.rowcount:
+            conn.execute("SELECT id,name,template_id,updated_at FROM resumes WHERE id=?", (rid,)).fetchone()
+        conn.close()
+
+    def get():
+        conn = legacy_connect()
+        conn.execute("SELECT * FROM resumes WHERE id=? AND user_id=?", (rid, user_id)).fetchone()
+        conn.close()
+
+    def list_():
+        conn = legacy_connect()
+        conn.execute("SELECT id,name,template_id,updated_at FROM resumes WHERE user_id=? ORDER BY updated_at DESC",
+                     (list_user,)).fetchall()
+        conn.close()
+
+    def batch_update():
+        conn = legacy_connect()
+        for _ in range(batch):
+            conn.execute("UPDATE resumes SET ats_terms=? WHERE id=?", ("{}", rid))
+        conn.commit()
+        conn.close()
+
+    return {"create": create, "update": update, "get": get, "list": list_, f"batch x{batch}": batch_update}
+
+
+def repository_ops(user_id: int, list_user: int, batch: int) -> dict:
+    repo = app.REPO
+
+    def create():
+        conn = app.get_db()
+        row = repo.write(conn, "resume_insert", (user_id, "Bench", "modern-01", DATA, None, PREVIEW, None))
+        conn.commit()
+        conn.close()
+        return row["id"]
+
+    rid = create()
+
+    def update():
+        conn = app.get_db()
+        repo.write(conn, "resume_update", ("Bench", "modern-01", DATA, None, PREVIEW, None, rid, user_id), row_id=rid)
+        conn.commit()
+        conn.close()
+
+    def get():
+        conn = app.get_db()
+        repo.one(conn, "resume_get", (rid, user_id))
+        conn.close()
+
+    def list_():
+        conn = app.get_db()
+        repo.all(conn, "resume_list", (list_user,))
+        conn.close()
+
+    def batch_update():
+        conn = app.get_db()
+        repo.many(conn, "ats_set_terms", [("{}", rid)] * batch)
+        conn.commit()
+        conn.close()
+
+    return {"create": create, "update": update, "get": get, "list": list_, f"batch x{batch}": batch_update}
+
+
+def measure(fn, iterations: int) -> tuple:
+    for _ in range(min(50, iterations)):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--iterations", type=int, default=2000)
+    ap.add_argument("--batch", type=int, default=50, help="rows per batched write")
+    ap.add_argument("--list-size", type=int, default=20, help="resumes in the account the list operation reads")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app.DB_PATH = os.path.join(tmp, "bench.db")
+        app.init_db()
+        conn = app.get_db()
+        user_id   = app.REPO.write(conn, "user_insert", ("Bench User", "bench@example.com", "x"))["id"]
+        list_user = app.REPO.write(conn, "user_insert", ("List User", "list@example.com", "x"))["id"]
+        # `list` reads a fixed account, so rows added by the create runs do not skew it
+        app.REPO.many(conn, "resume_insert", [(list_user, f"Resume {i}", "modern-01", DATA, None, PREVIEW, None)
+                                              for i in range(args.list_size)])
+        conn.commit()
+        conn.close()
+
+        print(f"SQLite {sqlite3.sqlite_version}, RETURNING {'on' if app.REPO.returning else 'off (read-back)'}, "
+              f"{args.iterations} iterations\n")
+        print(f"{'operation':<12}{'legacy p50':>12}{'p95':>10}{'repo p50':>12}{'p95':>10}{'speedup':>10}")
+        legacy, repo = legacy_ops(user_id, list_user, args.batch), repository_ops(user_id, list_user, args.batch)
+        for name in legacy:
+            l50, l95 = measure(legacy[name], args.iterations)
+            r50, r95 = measure(repo[name], args.iterations)
+            print(f"{name:<12}{l50:>12.0f}{l95:>10.0f}{r50:>12.0f}{r95:>10.0f}{l50 / r50:>9.1f}x")
+        print("\n(µs per operation)")
+
+
+if __name__ == "__main__":
+    main()
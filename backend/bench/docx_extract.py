@@ -0,0 +1,101 @@
+"""
+DOCX text extraction: streaming extractor vs the python-docx object model.
+
+Builds a synthetic resume (headings, bullet lists and layout tables — or uses
+--file) and extracts it both ways: docx_text.extract_docx, which parses
+word/document.xml incrementally, and python-docx's Document().paragraphs,
+which is what parse_resume used before. Reports the median time, peak Python
+memory (tracemalloc) and how many characters each one recovered. python-docx
+ignores tables, so its character count is lower on table-heavy documents.
+
+Usage:
+    python bench/docx_extract.py                         # ~2 page resume, 20 runs
+    python bench/docx_extract.py --scale 50 --runs 5     # a 50x longer document
+    python bench/docx_extract.py --file my_resume.docx
+"""
+import io
+import os
+import sys
+import time
+import argparse
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import docx  # noqa: E402
+from docx_text import extract_docx  # noqa: E402
+
+MAX_XML_BYTES = 1 << 30
+
+
+def build_resume(scale: int) -> bytes:
+    doc = docx.Document()
+    doc.add_paragraph("Jo Tester", style="Title")
+    contact = doc.add_table(rows=1, cols=3)
+    for cell, text in zip(contact.rows[0].cells, ("jo@example.com", "+1 555 0100", "Berlin")):
+        cell.text = text
+    doc.add_heading("Summary", 1)
+    doc.add_paragraph("Backend engineer focused on distributed systems, data pipelines and developer tooling.")
+    doc.add_heading("Experience", 1)
+    for i in range(4 * scale):
+        role = doc.add_table(rows=1, cols=2)
+        role.cell(0, 0).text = f"Senior Engineer — Company {i}"
+        role.cell(0, 1).text = "2019 – 2023"
+        for j in range(4):
+            doc.add_paragraph(f"Delivered project {i}.{j}: cut p95 latency by {10 + j}% across {i + 3} services.",
+                              style="List Bullet")
+    doc.add_heading("Skills", 1)
+    skills = doc.add_table(rows=3, cols=2)
+    for row, (group, items) in zip(skills.rows, (("Languages", "Python, Go, SQL"), ("Data", "PostgreSQL, Kafka"),
+                                                 ("Cloud", "AWS, Kubernetes, Terraform"))):
+        row.cells[0].text, row.cells[1].text = group, items
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def python_docx_text(blob: bytes) -> str:
+    doc = docx.Document(io.BytesIO(blob))
+    return "\n".join([p.text for p in doc.paragraphs if p.text.strip()])
+
+
+def streaming_text(blob: bytes) -> str:
+    return extract_docx(io.BytesIO(blob), MAX_XML_BYTES)[0]
+
+
+def measure(fn, blob: bytes, runs: int) -> tuple:
+    text = fn(blob)  # warm-up
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(blob)
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn(blob)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak / 1024, len(text)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--scale", type=int, default=1, help="multiply the number of experience entries")
+    ap.add_argument("--file", help="benchmark an existing .docx instead of the synthetic resume")
+    args = ap.parse_args()
+
+    if args.file:
+        with open(args.file, "rb") as f:
+            blob = f.read()
+    else:
+        blob = build_resume(args.scale)
+    print(f"document: {len(blob) / 1024:.0f} KB, {args.runs} runs\n")
+    print(f"{'extractor':<14}{'median ms':>11}{'peak KB':>10}{'chars':>9}")
+    for name, fn in (("python-docx", python_docx_text), ("streaming", streaming_text)):
+        ms, peak_kb, chars = measure(fn, blob, args.runs)
+        print(f"{name:<14}{ms:>11.2f}{peak_kb:>10.0f}{chars:>9}")
+
+
+if __name__ == "__main__":
+    main()
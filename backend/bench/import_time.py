@@ -0,0 +1,93 @@
+"""
+Cold-start guard for the backend.
+
+Imports `app` in fresh interpreters and reports the median wall time, then
+checks that none of the lazily imported heavy dependencies were loaded.
+Exits non-zero when the median exceeds --budget-ms or a heavy module leaks
+into the import graph, so it can run as a CI step.
+
+Usage:
+    python bench/import_time.py                      # 7 runs, 600 ms budget
+    python bench/import_time.py --runs 15 --budget-ms 400 --route-groups auth,resumes
+    python bench/import_time.py --importtime         # per-module breakdown of the slowest imports
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must stay out of a plain `import app` — each is imported by the code path that needs it.
+LAZY_MODULES = ("docx", "pdfminer", "groq", "numpy", "PIL", "psycopg2")
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+
+def run_once(env: dict) -> dict:
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=BACKEND, env=env, capture_output=True, text=True)
+    if out.returncode:
+        sys.exit(f"FAIL: import app raised\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def importtime_report(env: dict, top: int):
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"], cwd=BACKEND, env=env,
+                         capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = [p.strip() for p in line.replace("import time:", "").split("|")]
+        rows.append((int(cumulative_us), int(self_us), name))
+    print(f"\n{'cumulative ms':>14}{'self ms':>10}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {name}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=7)
+    ap.add_argument("--budget-ms", type=float, default=600)
+    ap.add_argument("--route-groups", help="ROUTE_GROUPS for the probe (default: all)")
+    ap.add_argument("--importtime", action="store_true", help="print the slowest imports (python -X importtime)")
+    ap.add_argument("--top", type=int, default=20)
+    args = ap.parse_args()
+
+    env = dict(os.environ)
+    if args.route_groups:
+        env["ROUTE_GROUPS"] = args.route_groups
+
+    run_once(env)  # warm the bytecode cache so every measured run is comparable
+    results = [run_once(env) for _ in range(args.runs)]
+    times   = sorted(r["seconds"] * 1000 for r in results)
+    median  = statistics.median(times)
+    leaked  = sorted({m for r in results for m in r["loaded"]})
+
+    print(f"import app: median {median:.0f} ms, min {times[0]:.0f} ms, max {times[-1]:.0f} ms "
+          f"over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    if args.importtime:
+        importtime_report(env, args.top)
+
+    failed = False
+    if leaked:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(leaked)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL: median import time {median:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
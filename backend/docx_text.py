@@ -0,0 +1,164 @@
+"""
+Streaming text extraction for DOCX uploads.
+
+Reads `word/document.xml` straight out of the zip with an incremental XML
+parser instead of building python-docx's object model, clearing each
+top-level block once it has been emitted, so time and memory stay flat with
+document size. Paragraphs, table cells (row by row, including nested tables)
+and text boxes are emitted in reading order. Paragraphs with a heading style
+or outline level are returned as heading hints for the section segmenter;
+list paragraphs are prefixed with a bullet.
+"""
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+W        = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+BULLET   = "• "
+
+MAX_STYLES_XML_BYTES = 4 * 1024 * 1024
+MAX_HEADING_CHARS    = 60
+
+_SPACE_RE = re.compile(r"[ \t\u00a0]+")
+_KNOWN_STYLES = re.compile(r"^(?:(Heading[1-9])|(List\w*)|Normal|Title|Subtitle|NoSpacing|BodyText\d?|Quote)$")
+_BREAKS   = {W + "br": "\n", W + "cr": "\n", W + "tab": "\t", W + "noBreakHyphen": "-"}
+
+
+def _val(elem, path: str) -> str | None:
+    child = elem.find(path)
+    return None if child is None else child.get(W + "val")
+
+
+def _outline_level(elem) -> str | None:
+    level = _val(elem, f"{W}pPr/{W}outlineLvl")
+    return None if level == "9" else level  # 9 = body text
+
+
+class _Styles:
+    """
+    Classifies paragraph style ids as "heading", "list" or None. Ids Word derives from the
+    built-in English names are recognised directly; word/styles.xml — typically hundreds of KB,
+    mostly latent styles — is only parsed the first time a document uses any other id.
+    """
+
+    def __init__(self, zf: zipfile.ZipFile):
+        self._zf    = zf
+        self._kinds = None  # style id -> kind, once styles.xml has been read
+
+    def kind(self, style_id: str | None) -> str | None:
+        if not style_id:
+            return None
+        known = _KNOWN_STYLES.match(style_id)
+        if known:
+            return "heading" if known.group(1) else "list" if known.group(2) else None
+        if self._kinds is None:
+            self._kinds = self._load()
+        return self._kinds.get(style_id)
+
+    def _load(self) -> dict:
+        kinds = {}
+        try:
+            info = self._zf.getinfo("word/styles.xml")
+        except KeyError:
+            return kinds
+        if info.file_size > MAX_STYLES_XML_BYTES:
+            return kinds
+        with self._zf.open(info) as xml:
+            for _, elem in iterparse(xml):
+                if elem.tag != W + "style":
+                    continue
+                if elem.get(W + "type") == "paragraph":
+                    name = (_val(elem, W + "name") or "").lower()
+                    if name.startswith("heading") or _outline_level(elem) is not None:
+                        kinds[elem.get(W + "styleId")] = "heading"
+                    elif name.startswith("list"):
+                        kinds[elem.get(W + "styleId")] = "list"
+                elem.clear()
+        return kinds
+
+
+def _lines(text: str) -> list:
+    return [ln for ln in (_SPACE_RE.sub(" ", part).strip() for part in text.split("\n")) if ln]
+
+
+def extract_docx(view, max_xml_bytes: int) -> tuple:
+    """
+    Returns (text, headings): one line per paragraph or table row, and the set of lines
+    that are headings. Raises ValueError when word/document.xml is over `max_xml_bytes`.
+    """
+    with zipfile.ZipFile(view) as zf:
+        info = zf.getinfo("word/document.xml")
+        if info.file_size > max_xml_bytes:
+            raise ValueError("word/document.xml is too large")
+        with zf.open(info) as xml:
+            return _walk(xml, _Styles(zf))
+
+
+def _walk(xml, styles: _Styles) -> tuple:
+    out, headings = [], set()
+    runs   = []    # text of each open paragraph; text boxes open paragraphs inside a paragraph
+    tables = []    # open tables: {"row": [cells] | None, "cell": [lines] | None}
+    skip   = 0     # depth inside mc:Fallback, which repeats the mc:Choice content
+    body   = None
+
+    def sink() -> list:
+        return tables[-1]["cell"] if tables and tables[-1]["cell"] is not None else out
+
+    for event, elem in iterparse(xml, events=("start", "end")):
+        tag = elem.tag
+        if tag == FALLBACK:
+            skip += 1 if event == "start" else -1
+            continue
+        if skip:
+            continue
+
+        if event == "start":
+            if tag == W + "p":
+                runs.append([])
+            elif tag == W + "tbl":
+                tables.append({"row": None, "cell": None})
+            elif tag == W + "tr":
+                tables[-1]["row"] = []
+            elif tag == W + "tc":
+                tables[-1]["cell"] = []
+            elif tag == W + "body":
+                body = elem
+            continue
+
+        if tag == W + "t":
+            if runs:
+                runs[-1].append(elem.text or "")
+        elif tag in _BREAKS:
+            if runs:
+                runs[-1].append(_BREAKS[tag])
+        elif tag == W + "p":
+            lines = _lines("".join(runs.pop()))
+            if lines:
+                style = styles.kind(_val(elem, f"{W}pPr/{W}pStyle"))
+                if len(lines) == 1 and len(lines[0]) <= MAX_HEADING_CHARS and (
+                        style == "heading" or _outline_level(elem) is not None):
+                    headings.add(lines[0])
+                elif style == "list" or elem.find(f"{W}pPr/{W}numPr") is not None:
+                    lines[0] = BULLET + lines[0]
+                sink().extend(lines)
+        elif tag == W + "tc":
+            table = tables[-1]
+            table["row"].append(table["cell"])
+            table["cell"] = None
+        elif tag == W + "tr":
+            cells = [c for c in tables[-1]["row"] if c]
+            tables[-1]["row"] = None
+            target = tables[-2]["cell"] if len(tables) > 1 and tables[-2]["cell"] is not None else out
+            if all(len(c) == 1 for c in cells):
+                if cells:
+                    target.append(" | ".join(c[0] for c in cells))  # a row of short cells reads as one line
+            else:
+                for cell in cells:
+                    target.extend(cell)
+        elif tag == W + "tbl":
+            tables.pop()
+
+        if body is not None and not runs and not tables and tag in (W + "p", W + "tbl", W + "sdt"):
+            body.clear()  # the block has been emitted; drop it from the tree
+    return "\n".join(out), headings
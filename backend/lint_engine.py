@@ -0,0 +1,191 @@
+"""
+LLM-free resume lint engine.
+
+All rules (misspellings, weak words, weak opening verbs, stock phrases) are
+compiled once into a single Aho-Corasick automaton, so a whole resume — every
+text field joined into one buffer — is checked in one linear pass no matter
+how many rules exist. Rule tables mirror frontend/src/lib/grammarEngine.ts.
+"""
+import bisect
+from collections import deque
+
+ACTION_VERB_MAP = {
+    "made":      ["engineered", "developed", "built", "created", "crafted"],
+    "did":       ["executed", "accomplished", "managed", "delivered", "achieved"],
+    "worked":    ["collaborated", "partnered", "contributed", "engaged", "operated"],
+    "helped":    ["facilitated", "supported", "assisted", "enabled", "empowered"],
+    "used":      ["leveraged", "utilized", "implemented", "applied", "deployed"],
+    "got":       ["obtained", "secured", "acquired", "earned", "attained"],
+    "improved":  ["optimized", "enhanced", "elevated", "transformed", "amplified"],
+    "increased": ["accelerated", "expanded", "maximized", "boosted", "scaled"],
+    "reduced":   ["minimized", "streamlined", "cut", "eliminated", "trimmed"],
+    "led":       ["spearheaded", "orchestrated", "directed", "championed", "steered"],
+    "managed":   ["oversaw", "supervised", "coordinated", "governed", "administered"],
+    "created":   ["architected", "designed", "established", "launched", "pioneered"],
+    "developed": ["engineered", "built", "constructed", "implemented", "delivered"],
+    "handled":   ["managed", "executed", "processed", "oversaw", "administered"],
+    "ran":       ["operated", "executed", "directed", "managed", "administered"],
+    "built":     ["engineered", "architected", "constructed", "developed", "crafted"],
+    "wrote":     ["authored", "drafted", "documented", "composed", "produced"],
+    "designed":  ["architected", "crafted", "conceptualized", "engineered", "shaped"],
+    "tested":    ["validated", "verified", "evaluated", "assessed", "certified"],
+    "fixed":     ["resolved", "remediated", "debugged", "addressed", "corrected"],
+}
+
+WEAK_WORDS = [
+    "very", "really", "quite", "basically", "actually", "generally",
+    "somewhat", "kind of", "sort of", "a lot", "a bit", "just",
+]
+
+SPELLING_MAP = {
+    "expereince": "experience", "recieve": "receive", "achive": "achieve",
+    "acheive": "achieve", "teh": "the", "thier": "their", "occured": "occurred",
+    "occurance": "occurrence", "responsibilty": "responsibility",
+    "managment": "management", "developement": "development",
+    "implemenation": "implementation", "succes": "success",
+    "proffesional": "professional", "collaboarate": "collaborate",
+    "optmize": "optimize", "analysied": "analysed", "independant": "independent",
+    "calender": "calendar", "definately": "definitely", "enviroment": "environment",
+    "seperate": "separate", "manajer": "manager", "programe": "program",
+    "skilset": "skillset", "relavant": "relevant", "knowldge": "knowledge",
+    "prefered": "preferred", "requirment": "requirement",
+}
+
+STOCK_PHRASES = {
+    "responsible for": ["Led", "Owned", "Drove"],
+    "duties included": ["Delivered", "Executed"],
+    "worked on":       ["Built", "Delivered", "Contributed to"],
+    "in charge of":    ["Led", "Directed", "Oversaw"],
+    "team player":     ["Collaborated with"],
+}
+
+BULLET_MARKERS = "•-*–·▪◦> \t"
+
+
+class Rule:
+    __slots__ = ("pattern", "kind", "message", "suggestions", "line_start")
+
+    def __init__(self, pattern, kind, message, suggestions, line_start=False):
+        self.pattern     = pattern
+        self.kind        = kind
+        self.message     = message
+        self.suggestions = suggestions
+        self.line_start  = line_start  # only fires as the first word of a line / bullet
+
+
+def default_rules() -> list:
+    rules = [Rule(w, "spelling", f'Possible misspelling of "{fix}".', [fix]) for w, fix in SPELLING_MAP.items()]
+    rules += [Rule(w, "weak-word", f'"{w}" weakens the sentence; consider removing it.', [""]) for w in WEAK_WORDS]
+    rules += [Rule(v, "weak-verb", f'Start with a stronger action verb than "{v}".', alts, line_start=True)
+              for v, alts in ACTION_VERB_MAP.items()]
+    rules += [Rule(p, "stock-phrase", f'"{p}" describes duties, not impact.', alts) for p, alts in STOCK_PHRASES.items()]
+    return rules
+
+
+def _fold(ch: str) -> str:
+    low = ch.lower()
+    return low if len(low) == 1 else ch  # keep offsets stable for chars whose lowercase expands
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _at_line_start(text: str, pos: int) -> bool:
+    pos -= 1
+    while pos >= 0 and text[pos] in BULLET_MARKERS:
+        pos -= 1
+    return pos < 0 or text[pos] == "\n"
+
+
+class Automaton:
+    """Classic Aho-Corasick: trie goto edges, BFS failure links, merged outputs."""
+
+    def __init__(self, rules: list):
+        self.rules   = rules
+        self.goto    = [{}]
+        self.fail    = [0]
+        self.outputs = [[]]
+        for idx, rule in enumerate(rules):
+            state = 0
+            for ch in rule.pattern.lower():
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({}); self.fail.append(0); self.outputs.append([])
+                state = nxt
+            self.outputs[state].append(idx)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.outputs[nxt] = self.outputs[nxt] + self.outputs[self.fail[nxt]]
+
+    def scan(self, text: str):
+        """Yield (start, end, rule) for every whole-word occurrence of every rule."""
+        state, goto, fail, outputs, n = 0, self.goto, self.fail, self.outputs, len(text)
+        for i, ch in enumerate(text):
+            ch = _fold(ch)
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for idx in outputs[state]:
+                rule  = self.rules[idx]
+                start = i - len(rule.pattern) + 1
+                if (start > 0 and _is_word(text[start - 1])) or (i + 1 < n and _is_word(text[i + 1])):
+                    continue
+                if rule.line_start and not _at_line_start(text, start):
+                    continue
+                yield start, i + 1, rule
+
+
+def document_fields(resume: dict) -> list:
+    """(field path, text) for every free-text field of a resume."""
+    fields = []
+    title = (resume.get("personalInfo") or {}).get("title")
+    if title:
+        fields.append(("personalInfo.title", title))
+    if resume.get("summary"):
+        fields.append(("summary", resume["summary"]))
+    for section in ("experience", "projects", "extracurricular"):
+        for i, item in enumerate(resume.get(section) or []):
+            if isinstance(item, dict) and item.get("description"):
+                fields.append((f"{section}[{i}].description", item["description"]))
+    return [(path, text) for path, text in fields if isinstance(text, str)]
+
+
+class LintEngine:
+    def __init__(self, rules: list | None = None):
+        self.automaton = Automaton(rules or default_rules())
+
+    def lint_document(self, resume: dict) -> dict:
+        fields = document_fields(resume)
+        # One buffer for the whole document; "\n" separators keep fields apart and act as line starts.
+        starts, parts, offset = [], [], 0
+        for _, text in fields:
+            starts.append(offset)
+            parts.append(text)
+            offset += len(text) + 1
+        buffer = "\n".join(parts)
+
+        findings, counts = [], {}
+        for start, end, rule in self.automaton.scan(buffer):
+            f = bisect.bisect_right(starts, start) - 1
+            path, text = fields[f]
+            local = start - starts[f]
+            span  = text[local:local + end - start]
+            suggestions = [s.capitalize() if span[:1].isupper() else s for s in rule.suggestions]
+            findings.append({"field": path, "start": local, "end": local + len(span), "text": span,
+                             "rule": rule.kind, "message": rule.message, "suggestions": suggestions})
+            counts[rule.kind] = counts.get(rule.kind, 0) + 1
+        return {"findings": findings, "counts": counts}
+
+    def lint_batch(self, resumes: list) -> list:
+        return [self.lint_document(r if isinstance(r, dict) else {}) for r in resumes]
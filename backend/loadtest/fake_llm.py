@@ -0,0 +1,219 @@
+"""
+Fake LLM provider for offline load tests.
+
+Speaks just enough of the wire formats the backend uses:
+  POST /openai/v1/chat/completions                 (Groq SDK)
+  POST /v1/chat/completions                        (OpenAI / DeepSeek via _post_json)
+  POST /v1beta/models/<model>:generateContent      (Gemini)
+  POST /v1beta/models/<model>:streamGenerateContent (Gemini, SSE with ?alt=sse)
+Chat completions also stream (SSE) when the body has "stream": true.
+
+Usage:
+    python loadtest/fake_llm.py --port 8089 --latency lognormal:400,0.5 --error-rate 0.02 --rate-limit 0.05
+
+Then start the backend with:
+    GROQ_BASE_URL=http://localhost:8089 GEMINI_BASE_URL=http://localhost:8089 \
+    OPENAI_BASE_URL=http://localhost:8089 DEEPSEEK_BASE_URL=http://localhost:8089 \
+    GROQ_API_KEY=fake GEMINI_API_KEY=fake python app.py
+"""
+import re
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+CANNED_RESUME = {
+    "personalInfo": {"fullName": "Alex Doe", "email": "alex@example.com", "phone": "+1 555 0100",
+                     "location": "Remote", "title": "Software Engineer", "website": "", "linkedin": ""},
+    "summary": "Backend engineer focused on reliable, observable services.",
+    "experience": [{"company": "Example Corp", "position": "Software Engineer", "startDate": "2021",
+                    "endDate": "Present", "description": "• Built APIs\n• Cut p99 latency by 40%"}],
+    "education": [{"school": "State University", "degree": "BSc", "field": "Computer Science",
+                   "startDate": "2016", "endDate": "2020"}],
+    "projects": [],
+    "skills": ["Python", "Flask", "PostgreSQL"],
+}
+
+CANNED_SUGGESTIONS = [
+    {"category": c, "title": f"Improve {c.lower()}", "suggestion": f"Tighten the {c.lower()} section.", "priority": p}
+    for c, p in (("Summary", "high"), ("Experience", "high"), ("Skills", "medium"), ("ATS", "medium"), ("Format", "low"))
+]
+
+CANNED_TEXT = "• Led migration to a service-oriented architecture\n• Reduced deployment time by 60%"
+
+
+def parse_latency(spec: str):
+    """fixed:MS | uniform:LO,HI | lognormal:MEDIAN_MS,SIGMA  →  callable returning seconds."""
+    kind, _, args = spec.partition(":")
+    nums = [float(x) for x in args.split(",") if x]
+    if kind == "fixed":
+        return lambda: nums[0] / 1000
+    if kind == "uniform":
+        return lambda: random.uniform(nums[0], nums[1]) / 1000
+    if kind == "lognormal":
+        import math
+        mu = math.log(nums[0])
+        return lambda: random.lognormvariate(mu, nums[1]) / 1000
+    raise ValueError(f"unknown latency spec: {spec}")
+
+
+def canned_reply(prompt: str) -> str:
+    if "return as JSON" in prompt:
+        return "```json\n" + json.dumps(CANNED_RESUME) + "\n```"
+    if '"category"' in prompt:  # suggestions; checked first, its prompt also mentions "Skills" and a JSON array
+        return json.dumps(CANNED_SUGGESTIONS)
+    if "partial skill" in prompt:
+        return json.dumps(["Python", "Go", "Rust", "TypeScript", "Kubernetes", "Docker", "SQL", "AWS"])
+    return CANNED_TEXT
+
+
+class Stats:
+    def __init__(self):
+        self.lock   = threading.Lock()
+        self.counts = {}
+
+    def bump(self, key: str):
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = None  # set by serve()
+    stats  = None
+
+    def log_message(self, fmt, *args):
+        if self.config.verbose:
+            super().log_message(fmt, *args)
+
+    def _send_json(self, status: int, payload: dict, headers: dict | None = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_sse(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def _sse(self, payload):
+        data = payload if isinstance(payload, str) else json.dumps(payload)
+        self.wfile.write(f"data: {data}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/stats":
+            return self._send_json(200, self.stats.counts)
+        self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            return self._send_json(400, {"error": {"message": "invalid JSON"}})
+
+        path = self.path.split("?")[0]
+        if path.endswith("/chat/completions"):
+            route = "chat"
+        elif re.search(r"/v1beta/models/[^/:]+:(generateContent|streamGenerateContent)$", path):
+            route = "gemini"
+        else:
+            return self._send_json(404, {"error": {"message": f"unknown path {path}"}})
+
+        time.sleep(self.config.latency())
+        roll = random.random()
+        if roll < self.config.rate_limit:
+            self.stats.bump(f"{route}:429")
+            return self._send_json(429, {"error": {"message": "Rate limit reached (fake)", "code": 429}},
+                                   {"Retry-After": str(self.config.retry_after)})
+        if roll < self.config.rate_limit + self.config.error_rate:
+            self.stats.bump(f"{route}:500")
+            return self._send_json(500, {"error": {"message": "Internal error (fake)", "code": 500}})
+        self.stats.bump(f"{route}:200")
+
+        if route == "chat":
+            prompt = " ".join(m.get("content", "") for m in body.get("messages", []))
+            return self._chat(body, canned_reply(prompt))
+        prompt = " ".join(p.get("text", "") for c in body.get("contents", []) for p in c.get("parts", []))
+        return self._gemini(path.endswith(":streamGenerateContent"), canned_reply(prompt))
+
+    def _chat(self, body: dict, text: str):
+        ident, created, model = f"chatcmpl-{uuid.uuid4().hex[:12]}", int(time.time()), body.get("model", "fake")
+        if not body.get("stream"):
+            return self._send_json(200, {
+                "id": ident, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(text) // 4, "total_tokens": len(text) // 4},
+            })
+        self._start_sse()
+        for piece in re.findall(r"\S+\s*", text):
+            time.sleep(self.config.token_delay)
+            self._sse({"id": ident, "object": "chat.completion.chunk", "created": created, "model": model,
+                       "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]})
+        self._sse({"id": ident, "object": "chat.completion.chunk", "created": created, "model": model,
+                   "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        self._sse("[DONE]")
+
+    def _gemini(self, stream: bool, text: str):
+        def candidate(t, finish=None):
+            c = {"content": {"role": "model", "parts": [{"text": t}]}, "index": 0}
+            if finish:
+                c["finishReason"] = finish
+            return {"candidates": [c]}
+
+        if not stream:
+            return self._send_json(200, candidate(text, "STOP"))
+        self._start_sse()
+        for piece in re.findall(r"\S+\s*", text):
+            time.sleep(self.config.token_delay)
+            self._sse(candidate(piece))
+        self._sse(candidate("", "STOP"))
+
+
+def serve(args):
+    FakeLLMHandler.config = args
+    FakeLLMHandler.stats  = Stats()
+    server = ThreadingHTTPServer((args.host, args.port), FakeLLMHandler)
+    server.daemon_threads = True
+    print(f"🤖  Fake LLM listening on http://{args.host}:{args.port} "
+          f"(errors {args.error_rate:.0%}, 429s {args.rate_limit:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served: {json.dumps(FakeLLMHandler.stats.counts)}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--latency", type=parse_latency, default="lognormal:300,0.4",
+                    help="fixed:MS | uniform:LO,HI | lognormal:MEDIAN_MS,SIGMA (default lognormal:300,0.4)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    ap.add_argument("--rate-limit", type=float, default=0.0, help="fraction of requests answered with 429")
+    ap.add_argument("--retry-after", type=int, default=5, help="Retry-After seconds sent with 429s")
+    ap.add_argument("--token-delay", type=float, default=0.02, help="seconds between streamed chunks")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+    serve(args)
+
+
+if __name__ == "__main__":
+    main()
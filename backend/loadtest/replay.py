@@ -0,0 +1,206 @@
+"""
+Traffic-replay load generator for the ResumeForge API.
+
+Two modes:
+  * mix (closed loop)  — N virtual users pick operations by weight for --duration seconds.
+  * trace (open loop)  — replay a JSONL trace of {"at": seconds_from_start, "op": "<name>"} lines
+                         at the recorded times, regardless of how fast the server answers.
+
+Operations: auth (login + me), crud (create → get → update → list → delete), enhance, suggest, parse.
+
+Usage:
+    python loadtest/replay.py --base-url http://localhost:5000/api --users 16 --duration 60 \
+        --mix auth=1,crud=6,enhance=2,suggest=1,parse=1
+    python loadtest/replay.py --trace traffic.jsonl --users 32
+
+Pair with loadtest/fake_llm.py so AI operations never hit real provider quotas.
+"""
+import io
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+SAMPLE_RESUME = {
+    "personalInfo": {"fullName": "Load Tester", "email": "load@example.com", "title": "Engineer"},
+    "summary": "Engineer who builds and operates web services.",
+    "experience": [{"id": "0", "company": "Example", "position": "Engineer", "startDate": "2020", "endDate": "Present",
+                    "description": "• Built things\n• Shipped features weekly"}],
+    "education": [], "projects": [], "skills": ["Python", "SQL"], "languages": [], "certifications": [],
+}
+
+SAMPLE_TXT = ("Load Tester\nload@example.com\n\nSUMMARY\nEngineer who builds web services.\n\n"
+              "EXPERIENCE\nEngineer | Example Corp | 2020 - Present\n- Built APIs\n\nSKILLS\nPython, SQL\n")
+
+
+class Recorder:
+    def __init__(self):
+        self.lock    = threading.Lock()
+        self.samples = {}  # op -> list[(seconds, ok)]
+
+    def add(self, op: str, seconds: float, ok: bool):
+        with self.lock:
+            self.samples.setdefault(op, []).append((seconds, ok))
+
+    def report(self, wall: float) -> dict:
+        out = {}
+        for op, samples in sorted(self.samples.items()):
+            lat = sorted(s for s, _ in samples)
+            pct = lambda p: lat[min(len(lat) - 1, int(p * len(lat)))] * 1000
+            out[op] = {"count": len(lat), "errors": sum(1 for _, ok in samples if not ok),
+                       "rps": round(len(lat) / wall, 2), "p50": round(pct(0.50), 1), "p95": round(pct(0.95), 1),
+                       "p99": round(pct(0.99), 1), "max": round(lat[-1] * 1000, 1)}
+        return out
+
+
+class Client:
+    def __init__(self, base_url: str, recorder: Recorder, timeout: float):
+        self.base     = base_url.rstrip("/")
+        self.recorder = recorder
+        self.timeout  = timeout
+        self.token    = None
+        self.email    = f"load-{uuid.uuid4().hex[:10]}@example.com"
+        self.password = "load-test-password"
+
+    def call(self, name: str, method: str, path: str, body=None, raw: bytes | None = None, content_type=None):
+        headers = {}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        data = raw
+        if body is not None:
+            data, content_type = json.dumps(body).encode("utf-8"), "application/json"
+        if content_type:
+            headers["Content-Type"] = content_type
+        req   = urllib.request.Request(self.base + path, data=data, headers=headers, method=method)
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                payload, ok = resp.read(), True
+        except urllib.error.HTTPError as e:
+            payload, ok = e.read(), False
+        except Exception:
+            payload, ok = b"", False
+        self.recorder.add(name, time.perf_counter() - start, ok)
+        try:
+            return json.loads(payload) if payload else {}
+        except json.JSONDecodeError:
+            return {}
+
+    def ensure_account(self):
+        if self.token:
+            return
+        res = self.call("register", "POST", "/auth/register",
+                        {"full_name": "Load Tester", "email": self.email, "password": self.password})
+        self.token = res.get("token")
+
+    # ── operations ───────────────────────────────────────────────────────────
+
+    def op_auth(self):
+        self.token = self.call("login", "POST", "/auth/login", {"email": self.email, "password": self.password}).get("token")
+        self.call("me", "GET", "/auth/me")
+
+    def op_crud(self):
+        created = self.call("create", "POST", "/resumes", {"name": "Load CV", "data": SAMPLE_RESUME})
+        rid = (created.get("resume") or {}).get("id")
+        if not rid:
+            return
+        self.call("get", "GET", f"/resumes/{rid}")
+        for _ in range(random.randint(1, 3)):  # autosave burst
+            self.call("update", "PUT", f"/resumes/{rid}", {"name": "Load CV", "data": SAMPLE_RESUME})
+        self.call("list", "GET", "/resumes")
+        self.call("delete", "DELETE", f"/resumes/{rid}")
+
+    def op_enhance(self):
+        mode = random.choice(["improve", "shorten", "expand", "ats", "regenerate"])
+        self.call("enhance", "POST", "/ai/enhance", {"text": "Built APIs and shipped features", "mode": mode})
+
+    def op_suggest(self):
+        self.call("suggest", "POST", "/ai/suggest", {"resume": SAMPLE_RESUME})
+
+    def op_parse(self):
+        boundary = uuid.uuid4().hex
+        body = io.BytesIO()
+        body.write(f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"resume.txt\"\r\n"
+                   f"Content-Type: text/plain\r\n\r\n".encode())
+        body.write(SAMPLE_TXT.encode("utf-8"))
+        body.write(f"\r\n--{boundary}--\r\n".encode())
+        self.call("parse", "POST", "/ai/parse-resume", raw=body.getvalue(),
+                  content_type=f"multipart/form-data; boundary={boundary}")
+
+
+def parse_mix(spec: str) -> dict:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def run_mix(args, recorder: Recorder):
+    ops, weights = zip(*parse_mix(args.mix).items())
+    deadline = time.monotonic() + args.duration
+
+    def user():
+        client = Client(args.base_url, recorder, args.timeout)
+        client.ensure_account()
+        while time.monotonic() < deadline:
+            getattr(client, f"op_{random.choices(ops, weights)[0]}")()
+            if args.think:
+                time.sleep(random.expovariate(1 / args.think))
+
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        for _ in range(args.users):
+            pool.submit(user)
+
+
+def run_trace(args, recorder: Recorder):
+    with open(args.trace, encoding="utf-8") as fh:
+        events = sorted((json.loads(line) for line in fh if line.strip()), key=lambda e: e["at"])
+    clients = [Client(args.base_url, recorder, args.timeout) for _ in range(args.users)]
+    for c in clients:
+        c.ensure_account()
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.users * 4) as pool:
+        for i, event in enumerate(events):
+            delay = start + event["at"] / args.speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(getattr(clients[i % len(clients)], f"op_{event['op']}"))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--base-url", default="http://localhost:5000/api")
+    ap.add_argument("--users", type=int, default=8, help="virtual users (mix) / client accounts (trace)")
+    ap.add_argument("--duration", type=float, default=30, help="seconds to run in mix mode")
+    ap.add_argument("--mix", default="auth=1,crud=6,enhance=2,suggest=1,parse=1")
+    ap.add_argument("--think", type=float, default=0.0, help="mean think time between operations (s)")
+    ap.add_argument("--trace", help="JSONL trace to replay instead of --mix")
+    ap.add_argument("--speed", type=float, default=1.0, help="trace replay speed multiplier")
+    ap.add_argument("--timeout", type=float, default=30)
+    ap.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = ap.parse_args()
+
+    recorder = Recorder()
+    started  = time.monotonic()
+    (run_trace if args.trace else run_mix)(args, recorder)
+    wall   = time.monotonic() - started
+    report = recorder.report(wall)
+
+    if args.json:
+        print(json.dumps({"wallSeconds": round(wall, 2), "ops": report}, indent=2))
+        return
+    total = sum(r["count"] for r in report.values())
+    print(f"\n{total} requests in {wall:.1f}s → {total / wall:.1f} req/s\n")
+    print(f"{'op':<10}{'count':>8}{'errors':>8}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for op, r in report.items():
+        print(f"{op:<10}{r['count']:>8}{r['errors']:>8}{r['rps']:>8}{r['p50']:>9}{r['p95']:>9}{r['p99']:>9}{r['max']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Dashboard previews, derived from a resume on every write.
+
+A preview is the handful of fields the resume list needs — headline, section
+counts and a short snippet — stored as a small JSON column next to the
+document, so listing resumes never loads the full `data` blobs. The photo,
+usually a base64 data URL of the original upload, is reduced to a thumbnail:
+downscaled to a small JPEG when Pillow is installed, otherwise kept only if it
+is already small enough.
+"""
+import io
+import re
+import json
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+
+COUNTED_SECTIONS = ("experience", "education", "projects", "extracurricular", "skills", "languages", "certifications")
+SNIPPET_CHARS    = 160
+MAX_PHOTO_URL    = 2048
+
+_DATA_URL_RE = re.compile(r"^data:(image/[\w.+-]+);base64,(.*)$", re.S)
+
+
+def _count(items) -> int:
+    return sum(1 for i in items or [] if i) if isinstance(items, list) else 0
+
+
+def _snippet(text: str) -> str:
+    text = " ".join(text.split())
+    if len(text) <= SNIPPET_CHARS:
+        return text
+    cut = text.rfind(" ", 0, SNIPPET_CHARS)
+    return text[:cut if cut > SNIPPET_CHARS // 2 else SNIPPET_CHARS].rstrip(" ,;:-") + "…"
+
+
+def resume_preview(data: dict) -> dict:
+    pi = data.get("personalInfo") or {}
+    text = (data.get("summary") or "").strip()
+    if not text:
+        jobs = [e for e in data.get("experience") or [] if isinstance(e, dict) and (e.get("description") or "").strip()]
+        text = jobs[0]["description"] if jobs else ""
+    return {
+        "fullName": (pi.get("fullName") or "").strip(),
+        "title":    (pi.get("title") or "").strip(),
+        "snippet":  _snippet(text),
+        "sections": {s: _count(data.get(s)) for s in COUNTED_SECTIONS},
+    }
+
+
+def encode_preview(data: dict) -> str:
+    return json.dumps(resume_preview(data), separators=(",", ":"), ensure_ascii=False)
+
+
+class Thumbnailer:
+    def __init__(self, size: int, max_bytes: int, cache_entries: int = 256):
+        self.size      = size
+        self.max_bytes = max_bytes
+        self._lock     = threading.Lock()
+        self._cache    = OrderedDict()  # sha256 of the photo -> thumbnail; autosaves resend the same photo
+        self._entries  = cache_entries
+
+    def __call__(self, data: dict) -> str | None:
+        photo = ((data.get("personalInfo") or {}).get("photo") or "").strip()
+        if not photo:
+            return None
+        if photo.startswith(("http://", "https://")):
+            return photo if len(photo) <= MAX_PHOTO_URL else None
+        key = hashlib.sha256(photo.encode("utf-8", "ignore")).digest()
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        thumb = self._thumbnail(photo)
+        with self._lock:
+            self._cache[key] = thumb
+            while len(self._cache) > self._entries:
+                self._cache.popitem(last=False)
+        return thumb
+
+    def _thumbnail(self, photo: str) -> str | None:
+        match = _DATA_URL_RE.match(photo)
+        if not match:
+            return None
+        try:
+            from PIL import Image  # optional; without it only already-small photos get a thumbnail
+        except ImportError:
+            return photo if len(photo) <= self.max_bytes else None
+        try:
+            with Image.open(io.BytesIO(base64.b64decode(match.group(2)))) as img:
+                img.draft("RGB", (self.size, self.size))  # JPEG: decode at a reduced scale; no-op otherwise
+                img.thumbnail((self.size, self.size))
+                out = io.BytesIO()
+                img.convert("RGB").save(out, "JPEG", quality=80, optimize=True)
+        except Exception as e:
+            print(f"[Preview] Could not thumbnail photo: {e}")
+            return None
+        thumb = "data:image/jpeg;base64," + base64.b64encode(out.getvalue()).decode("ascii")
+        return thumb if len(thumb) <= self.max_bytes else None
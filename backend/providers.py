@@ -0,0 +1,239 @@
+"""
+Latency-aware AI provider routing with per-provider circuit breakers.
+
+Every completion call is timed and fed into an EWMA of latency and error rate.
+Providers are tried per request in order of expected time-to-success, and a
+provider that keeps failing (or answers 429) is taken out of rotation until a
+cool-down expires. The next request then sends a single half-open probe to it,
+which decides whether it comes back.
+
+A request can carry a Deadline: its remaining time is split across the
+providers still to be tried and passed down as each call's timeout, and no
+new attempt starts once it has run out or the client has gone away.
+"""
+import time
+import threading
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+# A timeout only spares the circuit breaker when the call's share of the deadline was under
+# this fraction of the provider's observed latency — it never had a fair chance to answer.
+CUT_SHORT_RATIO = 0.5
+
+
+def is_rate_limit(exc: Exception) -> bool:
+    """429 from urllib (HTTPError.code), the Groq SDK (status_code) or anything that says so."""
+    return getattr(exc, "code", None) == 429 or getattr(exc, "status_code", None) == 429 or "429" in str(exc)
+
+
+def is_timeout(exc: Exception) -> bool:
+    """Socket timeouts from urllib (bare or wrapped in URLError.reason) and SDK timeout errors."""
+    return (isinstance(exc, TimeoutError) or isinstance(getattr(exc, "reason", None), TimeoutError)
+            or "timeout" in type(exc).__name__.lower())
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class ClientDisconnected(DeadlineExceeded):
+    pass
+
+
+class Deadline:
+    """The time budget of one request, shared by every provider attempt it makes."""
+
+    def __init__(self, seconds: float, disconnected=None):
+        self.seconds       = seconds
+        self.expires       = time.monotonic() + seconds
+        self._disconnected = disconnected  # () -> bool, None when the server cannot tell
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - time.monotonic())
+
+    def check(self):
+        """Raise instead of starting more work once the budget is spent or nobody is waiting for the answer."""
+        if self.remaining() <= 0:
+            raise DeadlineExceeded(f"deadline of {self.seconds:.1f}s exhausted")
+        if self._disconnected is not None and self._disconnected():
+            raise ClientDisconnected("client disconnected")
+
+    def attempt_timeout(self, attempts_left: int, floor: float, ceiling: float) -> float:
+        """An even share of what is left for each remaining attempt, but at least `floor` (while time lasts)."""
+        remaining = self.remaining()
+        return min(remaining, ceiling, max(remaining / max(attempts_left, 1), floor))
+
+
+def _retry_after(exc: Exception) -> float | None:
+    headers = getattr(exc, "headers", None) or getattr(getattr(exc, "response", None), "headers", None)
+    try:
+        return float(headers.get("Retry-After")) if headers else None
+    except (TypeError, ValueError):
+        return None
+
+
+class Provider:
+    def __init__(self, name: str, complete_fn, available_fn, prior_latency: float, alpha: float,
+                 failure_threshold: int, cooldown: float, max_cooldown: float, call_timeout: float):
+        self.name              = name
+        self._complete         = complete_fn
+        self._available        = available_fn
+        self.alpha             = alpha
+        self.failure_threshold = failure_threshold
+        self.base_cooldown     = cooldown
+        self.max_cooldown      = max_cooldown
+        self.call_timeout      = call_timeout
+
+        self.latency     = prior_latency  # EWMA seconds, seeded so the static order wins until we have data
+        self.error_rate  = 0.0            # EWMA of failures in [0, 1]
+        self.calls       = 0
+        self.failures    = 0              # consecutive
+        self.state       = CLOSED
+        self.cooldown    = cooldown
+        self.opened_at   = 0.0
+        self.probing     = False
+        self._lock       = threading.Lock()
+
+    # ── routing ──────────────────────────────────────────────────────────────
+
+    def available(self) -> bool:
+        return bool(self._available())
+
+    def expected_cost(self) -> float:
+        """Expected seconds to a successful answer: latency inflated by the failure rate."""
+        return self.latency / max(0.05, 1.0 - self.error_rate)
+
+    def may_allow(self) -> bool:
+        """Whether allow() could let a call through (without claiming a probe slot)."""
+        with self._lock:
+            return self.state != OPEN or time.monotonic() - self.opened_at >= self.cooldown
+
+    def probe_due(self) -> bool:
+        with self._lock:
+            return self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def release(self):
+        """Give up a half-open probe slot that ended without a recorded outcome."""
+        with self._lock:
+            self.probing = False
+
+    # ── bookkeeping ──────────────────────────────────────────────────────────
+
+    def _record(self, started: float, ok: bool, exc: Exception | None = None, count_failure: bool = True):
+        with self._lock:
+            self.calls     += 1
+            self.latency    = self.alpha * (time.monotonic() - started) + (1 - self.alpha) * self.latency
+            self.error_rate = self.alpha * (0.0 if ok else 1.0) + (1 - self.alpha) * self.error_rate
+            if self.state != CLOSED and started < self.opened_at:
+                return  # in flight when the breaker opened: a sample, but only the probe decides the state
+            self.probing    = False
+            if ok:
+                self.failures, self.state, self.cooldown = 0, CLOSED, self.base_cooldown
+                return
+            if not count_failure:
+                return
+            self.failures += 1
+            rate_limited   = exc is not None and is_rate_limit(exc)
+            if self.state == HALF_OPEN:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            if rate_limited or self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state     = OPEN
+                self.opened_at = time.monotonic()
+                if rate_limited:
+                    self.cooldown = min(max(self.cooldown, _retry_after(exc) or 0), self.max_cooldown)
+                print(f"[AI] {self.name} circuit open for {self.cooldown:.0f}s "
+                      f"({'rate limited' if rate_limited else f'{self.failures} consecutive failures'})")
+
+    def complete(self, prompt: str, timeout: float | None = None, **kwargs) -> str:
+        timeout = min(timeout, self.call_timeout) if timeout is not None else self.call_timeout
+        start   = time.monotonic()
+        try:
+            result = self._complete(prompt, timeout=timeout, **kwargs)
+        except Exception as exc:
+            # The elapsed time is always a latency sample. Only a timeout whose share of the deadline was
+            # well under the provider's usual latency leaves the consecutive-failure count alone.
+            cut_short = is_timeout(exc) and timeout < self.latency * CUT_SHORT_RATIO
+            self._record(start, False, exc, count_failure=not cut_short)
+            raise
+        self._record(start, True)
+        return result
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "latencyMs": round(self.latency * 1000), "errorRate": round(self.error_rate, 3),
+                    "calls": self.calls, "available": self.available()}
+
+
+class ProviderRegistry:
+    def __init__(self, alpha: float = 0.2, failure_threshold: int = 3, cooldown: float = 30.0,
+                 max_cooldown: float = 300.0, call_timeout: float = 12.0, min_attempt: float = 2.0):
+        self._providers   = {}
+        self.call_timeout = call_timeout
+        self.min_attempt  = min_attempt  # smallest share of a deadline given to one attempt
+        self._defaults    = dict(alpha=alpha, failure_threshold=failure_threshold,
+                                 cooldown=cooldown, max_cooldown=max_cooldown, call_timeout=call_timeout)
+
+    def register(self, name: str, complete_fn, available_fn):
+        """Registration order is the tie-breaker until real latency samples arrive."""
+        prior = 1.0 + 0.25 * len(self._providers)
+        self._providers[name] = Provider(name, complete_fn, available_fn, prior, **self._defaults)
+
+    def ordered(self, names=None) -> list:
+        """Cheapest expected latency first — except a provider whose cool-down just expired, which is probed first."""
+        candidates = [self._providers[n] for n in (names or self._providers) if n in self._providers]
+        return sorted((p for p in candidates if p.available()), key=lambda p: (not p.probe_due(), p.expected_cost()))
+
+    def run(self, work, names=None, label: str = "AI", deadline: Deadline | None = None):
+        """
+        Call `work(provider, timeout)` on each allowed provider, cheapest first, until one returns
+        a truthy result. Returns (result, provider_name) or (None, None). With a `deadline`, each
+        attempt's timeout is its share of the time left, and DeadlineExceeded is raised instead
+        of starting another attempt once the time is up or the client has disconnected.
+        """
+        providers = self.ordered(names)
+        for i, provider in enumerate(providers):
+            timeout = None
+            if deadline is not None:
+                try:
+                    deadline.check()
+                except DeadlineExceeded as exc:
+                    print(f"[{label}] Giving up before {provider.name}: {exc}")
+                    raise
+                attempts_left = sum(1 for p in providers[i:] if p.may_allow())
+                timeout = deadline.attempt_timeout(attempts_left, self.min_attempt, self.call_timeout)
+            if not provider.allow():
+                continue
+            try:
+                result = work(provider, timeout)
+            except Exception as exc:
+                if is_rate_limit(exc):
+                    print(f"[{label}] {provider.name} rate limit exceeded (429).")
+                else:
+                    print(f"[{label}] {provider.name} failed: {exc}")
+                continue
+            finally:
+                provider.release()
+            if result:
+                return result, provider.name
+        if deadline is not None:
+            deadline.check()  # the last attempt used up the budget: report a timeout, not "no provider"
+        return None, None
+
+    def complete(self, prompt: str, names=None, label: str = "AI", deadline: Deadline | None = None, **kwargs):
+        """Plain text completion through the fallback chain."""
+        return self.run(lambda p, timeout: (p.complete(prompt, timeout=timeout, **kwargs) or "").strip(),
+                        names, label, deadline)
+
+    def snapshot(self) -> dict:
+        return {name: p.snapshot() for name, p in self._providers.items()}
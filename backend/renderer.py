@@ -0,0 +1,359 @@
+"""
+Server-side resume rendering (PDF / DOCX) with an on-disk render cache.
+
+Rendering runs in a process pool so CPU-heavy layout never blocks the Flask
+request threads, and identical renders in flight are de-duplicated.
+Cache keys are (content hash, template id, renderer version), so an unchanged
+resume is only ever rendered once per format.
+"""
+import os
+import io
+import json
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Bump whenever the output of render_pdf / render_docx changes — old cache entries are then ignored.
+RENDERER_VERSION = "1"
+
+RENDER_FORMATS = {
+    "pdf":  "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+# Template ids look like "<category>-NN" (see frontend/src/data/templates.ts).
+CATEGORY_ACCENTS = {
+    "modern":    "#6366f1",
+    "minimal":   "#1e293b",
+    "creative":  "#7c3aed",
+    "corporate": "#1e3a5f",
+    "ats":       "#000000",
+}
+
+
+def _accent(template_id: str) -> tuple:
+    hex_color = CATEGORY_ACCENTS.get((template_id or "").split("-")[0], "#1e293b").lstrip("#")
+    return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _date_range(item: dict) -> str:
+    start, end = (item.get("startDate") or "").strip(), (item.get("endDate") or "").strip()
+    return f"{start} – {end}" if start and end else start or end
+
+
+def _bullets(description: str) -> list:
+    lines = [ln.strip().lstrip("•-*").strip() for ln in (description or "").splitlines()]
+    return [ln for ln in lines if ln]
+
+
+def resume_blocks(data: dict) -> list:
+    """Flatten resume JSON into (kind, text) blocks shared by every output format."""
+    pi     = data.get("personalInfo") or {}
+    blocks = []
+    if pi.get("fullName"):
+        blocks.append(("name", pi["fullName"]))
+    if pi.get("title"):
+        blocks.append(("title", pi["title"]))
+    contact = [pi.get(k) for k in ("email", "phone", "location", "linkedin", "github", "website", "portfolio")]
+    contact = " | ".join(c for c in contact if c)
+    if contact:
+        blocks.append(("contact", contact))
+
+    if (data.get("summary") or "").strip():
+        blocks += [("heading", "Summary"), ("para", data["summary"].strip())]
+
+    def entries(heading, items, title_fn):
+        items = [i for i in (items or []) if isinstance(i, dict)]
+        if not items:
+            return
+        blocks.append(("heading", heading))
+        for item in items:
+            blocks.append(("subheading", title_fn(item)))
+            if _date_range(item):
+                blocks.append(("meta", _date_range(item)))
+            blocks.extend(("bullet", b) for b in _bullets(item.get("description", "")))
+
+    entries("Experience", data.get("experience"),
+            lambda e: " — ".join(p for p in (e.get("position"), e.get("company")) if p))
+    entries("Projects", data.get("projects"),
+            lambda p: " — ".join(x for x in (p.get("name"), p.get("role")) if x))
+    entries("Education", data.get("education"),
+            lambda e: " — ".join(x for x in (" ".join(filter(None, (e.get("degree"), e.get("field")))), e.get("school")) if x))
+    entries("Extracurricular", data.get("extracurricular"),
+            lambda e: " — ".join(x for x in (e.get("title") or e.get("role"), e.get("organization")) if x))
+
+    if data.get("skills"):
+        blocks += [("heading", "Skills"), ("para", ", ".join(s for s in data["skills"] if s))]
+    if data.get("languages"):
+        blocks += [("heading", "Languages"), ("para", ", ".join(s for s in data["languages"] if s))]
+    certs = []
+    for c in data.get("certifications") or []:
+        if isinstance(c, dict):
+            certs.append(" — ".join(x for x in (c.get("name"), c.get("issuer"), c.get("date")) if x))
+        elif c:
+            certs.append(str(c))
+    if certs:
+        blocks.append(("heading", "Certifications"))
+        blocks.extend(("bullet", c) for c in certs)
+    return blocks
+
+
+# ─── DOCX ─────────────────────────────────────────────────────────────────────
+
+def render_docx(data: dict, template_id: str) -> bytes:
+    import docx
+    from docx.shared import Pt, RGBColor
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    accent = RGBColor(*_accent(template_id))
+    doc    = docx.Document()
+    for kind, text in resume_blocks(data):
+        if kind == "name":
+            p = doc.add_paragraph()
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            run = p.add_run(text); run.bold = True; run.font.size = Pt(20); run.font.color.rgb = accent
+        elif kind in ("title", "contact"):
+            p = doc.add_paragraph(text)
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        elif kind == "heading":
+            h = doc.add_heading(text.upper(), level=2)
+            for run in h.runs:
+                run.font.color.rgb = accent
+        elif kind == "subheading":
+            doc.add_paragraph().add_run(text).bold = True
+        elif kind == "meta":
+            doc.add_paragraph().add_run(text).italic = True
+        elif kind == "bullet":
+            doc.add_paragraph(text, style="List Bullet")
+        else:
+            doc.add_paragraph(text)
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+# ─── PDF (dependency-free, base-14 Helvetica) ─────────────────────────────────
+
+PAGE_W, PAGE_H, MARGIN = 612, 792, 54
+
+PDF_STYLES = {
+    #  kind         font  size  space-before  indent
+    "name":       ("F2", 20, 0,  0),
+    "title":      ("F1", 11, 4,  0),
+    "contact":    ("F1", 9,  2,  0),
+    "heading":    ("F2", 12, 14, 0),
+    "subheading": ("F2", 10, 6,  0),
+    "meta":       ("F1", 9,  1,  0),
+    "para":       ("F1", 10, 3,  0),
+    "bullet":     ("F1", 10, 2,  12),
+}
+
+
+def _char_width(ch: str) -> float:
+    """Rough Helvetica advance width in em — close enough for line wrapping."""
+    if ch in "il.,:;'|!()[]ftrjI ":
+        return 0.30
+    if ch in "mwMW@":
+        return 0.85
+    if ch.isupper() or ch.isdigit():
+        return 0.64
+    return 0.54
+
+
+def _wrap(text: str, size: int, width: float) -> list:
+    lines, line, line_w = [], "", 0.0
+    for word in text.split():
+        w = sum(_char_width(c) for c in word) * size
+        space = _char_width(" ") * size if line else 0
+        if line and line_w + space + w > width:
+            lines.append(line)
+            line, line_w = word, w
+        else:
+            line, line_w = f"{line} {word}" if line else word, line_w + space + w
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _pdf_escape(text: str) -> str:
+    text = text.replace("–", "-").replace("—", "-").replace("•", "-").replace("’", "'")
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_pdf(data: dict, template_id: str) -> bytes:
+    r, g, b  = (c / 255 for c in _accent(template_id))
+    centered = {"name", "title", "contact"}
+    pages, ops, y = [], [], PAGE_H - MARGIN
+
+    for kind, text in resume_blocks(data):
+        font, size, before, indent = PDF_STYLES[kind]
+        if kind == "heading":
+            text = text.upper()
+        if kind == "bullet":
+            text = "- " + text
+        y -= before
+        for line in _wrap(text, size, PAGE_W - 2 * MARGIN - indent):
+            if y - size < MARGIN:
+                pages.append(ops); ops, y = [], PAGE_H - MARGIN
+            y -= size * 1.25
+            x = MARGIN + indent
+            if kind in centered:
+                x = (PAGE_W - sum(_char_width(c) for c in line) * size) / 2
+            color = f"{r:.3f} {g:.3f} {b:.3f} rg" if kind in ("name", "heading") else "0 0 0 rg"
+            ops.append(f"BT {color} /{font} {size} Tf {x:.1f} {y:.1f} Td ({_pdf_escape(line)}) Tj ET")
+        if kind == "heading":
+            ops.append(f"{r:.3f} {g:.3f} {b:.3f} RG 0.8 w {MARGIN} {y - 3:.1f} m {PAGE_W - MARGIN} {y - 3:.1f} l S")
+            y -= 4
+    pages.append(ops)
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page object ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for page_ops in pages:
+        stream = "\n".join(page_ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+                        "/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>"
+                        % (PAGE_W, PAGE_H, len(objects))).encode())
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    out, offsets = io.BytesIO(), []
+    out.write(b"%PDF-1.4\n")
+    for num, obj in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % num + obj + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for off in offsets:
+        out.write(b"%010d 00000 n \n" % off)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+RENDERERS = {"pdf": render_pdf, "docx": render_docx}
+
+
+def render(fmt: str, data: dict, template_id: str) -> bytes:
+    """Top-level entry point — must stay picklable for the process pool."""
+    return RENDERERS[fmt](data, template_id)
+
+
+# ─── Cache + worker pool ──────────────────────────────────────────────────────
+
+def render_key(fmt: str, data: dict, template_id: str) -> str:
+    content = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    digest  = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{digest}|{template_id}|{RENDERER_VERSION}|{fmt}".encode()).hexdigest()
+
+
+class RenderCache:
+    """Content-addressed files under `root`; oldest entries are pruned once `max_bytes` is exceeded."""
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root      = root
+        self.max_bytes = max_bytes
+        self._writes   = 0
+
+    def _path(self, key: str, fmt: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.{fmt}")
+
+    def get(self, key: str, fmt: str) -> bytes | None:
+        path = self._path(key, fmt)
+        try:
+            with open(path, "rb") as fh:
+                blob = fh.read()
+            os.utime(path)  # refresh mtime so pruning is least-recently-used
+            return blob
+        except OSError:
+            return None
+
+    def put(self, key: str, fmt: str, blob: bytes):
+        path = self._path(key, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(blob)
+        os.replace(tmp, path)
+        self._writes += 1
+        if self._writes % 50 == 0:
+            self.prune()
+
+    def prune(self):
+        entries = []
+        for dirpath, _, files in os.walk(self.root):
+            for f in files:
+                p = os.path.join(dirpath, f)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(p)
+                total -= size
+            except OSError:
+                pass
+
+
+def _pool_context():
+    """
+    Workers are started from a clean process, never forked from the server: by the time the
+    pool is created its threads (requests, write-behind and precompute timers) may hold locks
+    that a forked child would inherit held and then deadlock on.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class RenderService:
+    """Cache lookup → single-flight → process pool."""
+
+    def __init__(self, cache: RenderCache, workers: int):
+        self.cache    = cache
+        self.workers  = workers
+        self._pool    = None
+        self._lock    = threading.Lock()
+        self._pending = {}
+
+    def render(self, fmt: str, data: dict, template_id: str, timeout: float) -> tuple:
+        """Returns (blob, cache_key, cache_hit)."""
+        key  = render_key(fmt, data, template_id)
+        blob = self.cache.get(key, fmt)
+        if blob is not None:
+            return blob, key, True
+
+        with self._lock:
+            future = self._pending.get(key)
+            owner  = future is None
+            if owner:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+                future = self._pool.submit(render, fmt, data, template_id)
+                self._pending[key] = future
+        try:
+            blob = future.result(timeout=timeout)
+            if owner:
+                self.cache.put(key, fmt, blob)
+        finally:
+            if owner:
+                with self._lock:
+                    self._pending.pop(key, None)
+        return blob, key, False
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
@@ -0,0 +1,226 @@
+"""
+Data-access layer: every SQL statement the backend runs, in one place.
+
+Statements are written once with `?` placeholders and rendered for the active
+backend when the Repository is built — never per call. Writes that need the
+row back use `INSERT/UPDATE … RETURNING`, which SQLite supports from 3.35 as
+PostgreSQL always has; on older SQLite the statement is rendered without the
+clause and the row is read back with a SELECT instead. Multi-row writes go
+through `many()` (executemany on SQLite, psycopg2's execute_batch on PG).
+
+SQLite connections come from a small pool, so each connection's prepared-
+statement cache (`cached_statements`) survives from one request to the next.
+"""
+import re
+import sqlite3
+import threading
+
+# name -> SQL shared by both backends, or (SQLite SQL, PostgreSQL SQL); None = not used on that backend
+STATEMENTS = {
+    "ping":            "SELECT 1 AS ok",
+
+    # users
+    "user_insert":     "INSERT INTO users (full_name,email,password) VALUES (?,?,?) RETURNING id,full_name,email",
+    "user_by_email":   "SELECT id,full_name,email,password FROM users WHERE email=?",
+    "user_by_id":      "SELECT id,full_name,email,created_at FROM users WHERE id=?",
+
+    # resumes
+    "resume_list":     "SELECT id,name,template_id,updated_at,preview,thumbnail, CASE WHEN preview IS NULL THEN data END AS data "
+                       "FROM resumes WHERE user_id=? ORDER BY updated_at DESC",
+    "resume_get":      "SELECT id,name,template_id,data,updated_at FROM resumes WHERE id=? AND user_id=?",
+    "resume_owned":    "SELECT 1 AS ok FROM resumes WHERE id=? AND user_id=?",
+    "resume_insert":   "INSERT INTO resumes (user_id,name,template_id,data,ats_terms,preview,thumbnail) VALUES (?,?,?,?,?,?,?) "
+                       "RETURNING id,name,template_id,updated_at",
+    "resume_update":   ("UPDATE resumes SET name=?,template_id=?,data=?,ats_terms=?,preview=?,thumbnail=?,"
+                        "updated_at=strftime('%Y-%m-%dT%H:%M:%f','now') WHERE id=? AND user_id=? "
+                        "RETURNING id,name,template_id,updated_at",
+                        "UPDATE resumes SET name=?,template_id=?,data=?,ats_terms=?,preview=?,thumbnail=?,updated_at=NOW() "
+                        "WHERE id=? AND user_id=? RETURNING id,name,template_id,updated_at"),
+    "resume_delete":   "DELETE FROM resumes WHERE id=? AND user_id=?",
+    "resume_export":   "SELECT id,name,template_id,data,updated_at FROM resumes WHERE user_id=? ORDER BY id",
+    "resume_all":      "SELECT id,user_id,name,data FROM resumes ORDER BY id",
+    "resume_stale_previews": "SELECT id,data FROM resumes WHERE preview IS NULL ORDER BY id",
+    "preview_set":     "UPDATE resumes SET preview=?, thumbnail=? WHERE id=?",
+
+    # ATS terms
+    "ats_candidates":  "SELECT id,name,ats_terms, CASE WHEN ats_terms IS NULL THEN data END AS data "
+                       "FROM resumes WHERE user_id=? ORDER BY updated_at DESC",
+    "ats_set_terms":   "UPDATE resumes SET ats_terms=? WHERE id=?",
+
+    # full-text search — FTS5 table on SQLite, tsvector columns on the row itself on PG
+    "search_unindex":  ("DELETE FROM resume_search WHERE rowid=?", None),
+    "search_index":    ("INSERT INTO resume_search (rowid,name,summary,experience,skills,projects,user_id) "
+                        "VALUES (?,?,?,?,?,?,?)",
+                        """UPDATE resumes SET search_text=?, search_tsv =
+                               setweight(to_tsvector('english', ?), 'A') || setweight(to_tsvector('english', ?), 'A') ||
+                               setweight(to_tsvector('english', ?), 'B') ||
+                               setweight(to_tsvector('english', ?), 'C') || setweight(to_tsvector('english', ?), 'C')
+                           WHERE id=?"""),
+    # bm25 column weights: name, summary, experience, skills, projects. Matches are delimited with
+    # \x02 / \x03, never with markup, so the snippet can be HTML-escaped before <mark> goes in.
+    "search_query":    ("""SELECT r.id, r.name, r.template_id, r.updated_at,
+                               -bm25(resume_search, 4.0, 2.0, 1.0, 4.0, 1.0) AS rank,
+                               snippet(resume_search, -1, char(2), char(3), '…', 16) AS snippet
+                           FROM resume_search JOIN resumes r ON r.id = resume_search.rowid
+                           WHERE resume_search MATCH ? AND resume_search.user_id = ?
+                           ORDER BY rank DESC LIMIT ?""",
+                        """SELECT id,name,template_id,updated_at, ts_rank(search_tsv, query) AS rank,
+                               ts_headline('english', search_text, query,
+                                           'StartSel=' || chr(2) || ',StopSel=' || chr(3) ||
+                                           ',MaxFragments=2,MaxWords=18,MinWords=6') AS snippet
+                           FROM resumes, to_tsquery('english', ?) query
+                           WHERE user_id=? AND search_tsv @@ query
+                           ORDER BY rank DESC LIMIT ?"""),
+
+    # revisions
+    "revision_chain":  """SELECT rev, kind, payload FROM resume_revisions
+                          WHERE resume_id=? AND rev<=? AND rev >= (
+                              SELECT MAX(rev) FROM resume_revisions WHERE resume_id=? AND rev<=? AND kind='full')
+                          ORDER BY rev""",
+    "revision_latest": "SELECT rev,kind,created_at FROM resume_revisions WHERE resume_id=? ORDER BY rev DESC LIMIT 1",
+    "revision_first":  "SELECT MIN(rev) AS rev FROM resume_revisions WHERE resume_id=?",
+    "revision_list":   "SELECT rev,kind,size,saves,created_at,saved_at FROM resume_revisions WHERE resume_id=? ORDER BY rev DESC",
+    "revision_insert": "INSERT INTO resume_revisions (resume_id,rev,kind,payload,size,saves,created_at,saved_at) "
+                       "VALUES (?,?,?,?,?,1,?,?)",
+    "revision_fold":   "UPDATE resume_revisions SET kind=?, payload=?, size=?, saves=saves+1, saved_at=? "
+                       "WHERE resume_id=? AND rev=?",
+    "revision_rebase": "UPDATE resume_revisions SET kind='full', payload=?, size=? WHERE resume_id=? AND rev=?",
+    "revision_trim":   "DELETE FROM resume_revisions WHERE resume_id=? AND rev<?",
+    "revision_purge":  "DELETE FROM resume_revisions WHERE resume_id=?",
+}
+
+_WRITE_RE     = re.compile(r"^\s*(?:INSERT\s+INTO|UPDATE)\s+(\w+)", re.I)
+_RETURNING_RE = re.compile(r"\s+RETURNING\s+(.+?)\s*$", re.I | re.S)
+
+
+def dict_factory(cursor, row):
+    return {col[0]: row[idx] for idx, col in enumerate(cursor.description)}
+
+
+class Repository:
+    def __init__(self, postgres: bool, stream_chunk_size: int = 100):
+        self.postgres   = postgres
+        self.returning  = postgres or sqlite3.sqlite_version_info >= (3, 35, 0)
+        self.chunk_size = stream_chunk_size
+        self.sql        = {}
+        self._readback  = {}  # name -> SELECT standing in for RETURNING on old SQLite
+        for name, text in STATEMENTS.items():
+            if isinstance(text, tuple):
+                text = text[1] if postgres else text[0]
+            if text is None:
+                continue
+            returning = _RETURNING_RE.search(text)
+            if returning and not self.returning:
+                table = _WRITE_RE.match(text).group(1)
+                self._readback[name] = f"SELECT {returning.group(1)} FROM {table} WHERE id=?"
+                text = text[:returning.start()]
+            self.sql[name] = text.replace("?", "%s") if postgres else text
+
+    def execute(self, conn, name: str, params=()):
+        if self.postgres:
+            cur = conn.cursor()
+            cur.execute(self.sql[name], params)
+            return cur
+        return conn.execute(self.sql[name], params)
+
+    def one(self, conn, name: str, params=()):
+        return self.execute(conn, name, params).fetchone()
+
+    def all(self, conn, name: str, params=()) -> list:
+        return self.execute(conn, name, params).fetchall()
+
+    def many(self, conn, name: str, rows: list):
+        """Run one statement for many parameter rows in a single batched call."""
+        if not rows:
+            return
+        if self.postgres:
+            from psycopg2.extras import execute_batch
+            with conn.cursor() as cur:
+                execute_batch(cur, self.sql[name], rows, page_size=200)
+        else:
+            conn.executemany(self.sql[name], rows)
+
+    def write(self, conn, name: str, params=(), row_id=None):
+        """
+        Run an INSERT/UPDATE … RETURNING statement and return the written row (None when nothing matched).
+        `row_id` identifies the row of an UPDATE for the read-back on SQLite < 3.35; inserts use lastrowid.
+        """
+        cur = self.execute(conn, name, params)
+        if name not in self._readback:
+            rows = cur.fetchall()  # drain, so the statement is finished before the caller commits
+            return rows[0] if rows else None
+        if not cur.rowcount:
+            return None
+        return conn.execute(self._readback[name], (row_id if row_id is not None else cur.lastrowid,)).fetchone()
+
+    def stream(self, conn, name: str, params=()):
+        """
+        Yield rows one at a time without materialising the whole result set.
+        PG uses a named (server-side) cursor; SQLite steps through with fetchmany.
+        """
+        if self.postgres:
+            cur = conn.cursor(name=f"stream_{name}")
+            cur.itersize = self.chunk_size
+        else:
+            cur = conn.cursor()
+        try:
+            cur.execute(self.sql[name], params)
+            while True:
+                rows = cur.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cur.close()
+
+
+class PooledConnection(sqlite3.Connection):
+    """A SQLite connection whose close() hands it back to its pool (after a rollback) instead of closing it."""
+
+    def close(self):
+        pool = getattr(self, "pool", None)
+        if pool is None or not pool.release(self):
+            super().close()
+
+
+class SQLitePool:
+    def __init__(self, path: str, size: int, cached_statements: int):
+        self.path              = path
+        self.size              = size
+        self.cached_statements = cached_statements
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def connect(self) -> PooledConnection:
+        with self._lock:
+            if self._idle:
+                conn = self._idle.pop()
+                conn.idle = False
+                return conn
+        conn = sqlite3.connect(self.path, factory=PooledConnection, check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        conn.row_factory = dict_factory
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.pool, conn.idle = self, False
+        return conn
+
+    def release(self, conn) -> bool:
+        if conn.idle:
+            return True  # closed twice
+        try:
+            conn.rollback()  # never hand out a connection with a transaction still open
+        except sqlite3.Error:
+            return False
+        with self._lock:
+            if len(self._idle) >= self.size:
+                return False
+            conn.idle = True
+            self._idle.append(conn)
+            return True
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.pool = None
+            conn.close()
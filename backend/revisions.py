@@ -0,0 +1,54 @@
+"""
+Compact deltas between resume versions.
+
+A version is a plain JSON document ({"name", "templateId", "data"}). A delta
+is a list of operations against its predecessor:
+    ["s", path, value]   set the value at path (dict keys only)
+    ["d", path]          delete the key at path
+Dicts are diffed recursively; any other changed value (lists, strings…) is
+replaced whole, which keeps deltas small for the typical "edit one field" autosave.
+"""
+import copy
+
+
+def diff(old, new, path=()) -> list:
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append(["d", [*path, key]])
+        for key, value in new.items():
+            if key not in old:
+                ops.append(["s", [*path, key], value])
+            elif old[key] != value:
+                ops.extend(diff(old[key], value, (*path, key)))
+        return ops
+    return [] if old == new else [["s", list(path), new]]
+
+
+def apply(doc, ops: list):
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        path = op[1]
+        if not path:  # whole-document replacement
+            doc = copy.deepcopy(op[2])
+            continue
+        parent = doc
+        for key in path[:-1]:
+            parent = parent.setdefault(key, {})
+        if op[0] == "s":
+            parent[path[-1]] = copy.deepcopy(op[2])
+        else:
+            parent.pop(path[-1], None)
+    return doc
+
+
+def materialize(chain: list):
+    """
+    `chain` is [(kind, payload), ...] in revision order, starting at a full snapshot.
+    Returns the document at the last revision of the chain.
+    """
+    doc = None
+    for kind, payload in chain:
+        doc = copy.deepcopy(payload) if kind == "full" else apply(doc, payload)
+    return doc
@@ -0,0 +1,126 @@
+"""
+Cache for AI resume suggestions.
+
+Entries are keyed by the SHA-256 of the exact resume summary text sent to the
+provider, so an unchanged resume never costs a second LLM call and any edit
+to a section that feeds the summary is a natural miss. The cache is a
+per-process LRU with a TTL; concurrent misses for the same key share one
+provider call. Saved resumes can be precomputed in the background, debounced
+so an autosave burst triggers a single call once the user pauses.
+"""
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+def summary_key(summary: str) -> str:
+    return hashlib.sha256(summary.encode("utf-8")).hexdigest()
+
+
+class SuggestionCache:
+    def __init__(self, max_entries: int, ttl: float, precompute_delay: float):
+        self.max_entries      = max_entries
+        self.ttl              = ttl
+        self.precompute_delay = precompute_delay
+        self._lock      = threading.Lock()
+        self._entries   = OrderedDict()  # key -> (stored_at, suggestions)
+        self._pending   = {}             # key -> Future, single-flight
+        self._by_resume = {}             # resume id -> key of its latest saved summary
+        self._timers    = {}             # resume id -> pending precompute Timer
+        self.hits = self.misses = self.precomputed = 0
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, suggestions: list):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), suggestions)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: str, compute, timeout: float | None = None) -> tuple:
+        """
+        Returns (suggestions, cache_hit). `compute()` returns a list to cache, or None
+        when no provider answered (nothing is cached then).
+        """
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached, True
+        with self._lock:
+            future = self._pending.get(key)
+            owner  = future is None
+            if owner:
+                future = self._pending[key] = Future()
+        if not owner:
+            return future.result(timeout=timeout), False
+
+        self.misses += 1
+        try:
+            suggestions = compute()
+            if suggestions is not None:
+                self.put(key, suggestions)
+            future.set_result(suggestions)
+            return suggestions, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def saved(self, resume_id, key: str, compute=None):
+        """
+        A resume was saved with summary `key`. Drops the entry for its previous summary when
+        the sections feeding it changed, and (when `compute` is given) schedules a precompute.
+        """
+        with self._lock:
+            previous = self._by_resume.get(resume_id)
+            self._by_resume[resume_id] = key
+            if previous is not None and previous != key:
+                self._entries.pop(previous, None)
+            timer = self._timers.pop(resume_id, None)
+        if timer:
+            timer.cancel()
+        if compute is None or (previous == key and self.get(key) is not None):
+            return
+        timer = threading.Timer(self.precompute_delay, self._precompute, (resume_id, key, compute))
+        timer.daemon = True
+        with self._lock:
+            self._timers[resume_id] = timer
+        timer.start()
+
+    def forget(self, resume_id):
+        with self._lock:
+            key   = self._by_resume.pop(resume_id, None)
+            timer = self._timers.pop(resume_id, None)
+            if key is not None:
+                self._entries.pop(key, None)
+        if timer:
+            timer.cancel()
+
+    def _precompute(self, resume_id, key: str, compute):
+        with self._lock:
+            if self._by_resume.get(resume_id) != key:
+                return  # superseded by a later save
+            self._timers.pop(resume_id, None)
+        try:
+            _, hit = self.get_or_compute(key, compute)
+            if not hit:
+                self.precomputed += 1
+        except Exception as e:
+            print(f"[Suggest] Precompute for resume {resume_id} failed: {e}")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        return {"entries": size, "hits": self.hits, "misses": self.misses, "precomputed": self.precomputed}
@@ -0,0 +1,99 @@
+import os
+import sys
+import time
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from providers import CLOSED, OPEN, Deadline, DeadlineExceeded, ProviderRegistry  # noqa: E402
+
+
+def hanging(prompt, timeout, **kwargs):
+    raise TimeoutError("timed out")
+
+
+def rate_limited(prompt, timeout, **kwargs):
+    raise RuntimeError("429 Too Many Requests")
+
+
+def registry(**kwargs) -> ProviderRegistry:
+    reg = ProviderRegistry(failure_threshold=3, call_timeout=12.0, min_attempt=0.0, **kwargs)
+    reg.register("hangs", hanging, lambda: True)
+    reg.register("backup", hanging, lambda: True)
+    return reg
+
+
+def test_timeouts_under_a_shared_deadline_trip_the_breaker():
+    reg = registry()
+    hangs = reg._providers["hangs"]
+    for _ in range(3):
+        try:
+            reg.complete("hi", names=["hangs", "backup"], deadline=Deadline(14.0))  # 7 s share, under call_timeout
+        except DeadlineExceeded:
+            pass
+    assert hangs.calls == 3
+    assert hangs.error_rate > 0
+    assert hangs.state == OPEN
+
+
+def test_timeout_far_below_observed_latency_is_sampled_but_not_counted():
+    reg = registry()
+    slow = reg._providers["hangs"]
+    slow.latency = 10.0
+    try:
+        slow.complete("hi", timeout=2.0)
+    except TimeoutError:
+        pass
+    assert slow.calls == 1
+    assert slow.latency < 10.0 and slow.error_rate > 0
+    assert slow.failures == 0 and slow.state == CLOSED
+
+
+def test_timeout_at_full_call_timeout_counts():
+    slow = registry()._providers["hangs"]
+    try:
+        slow.complete("hi")
+    except TimeoutError:
+        pass
+    assert slow.failures == 1
+
+
+def test_success_in_flight_when_the_breaker_opened_does_not_close_it():
+    release = threading.Event()
+
+    def slow_ok(prompt, timeout, **kwargs):
+        release.wait(5)
+        return "ok"
+
+    reg = ProviderRegistry(failure_threshold=3, cooldown=30.0)
+    reg.register("groq", slow_ok, lambda: True)
+    groq = reg._providers["groq"]
+    in_flight = threading.Thread(target=groq.complete, args=("hi",))
+    in_flight.start()
+    time.sleep(0.01)
+
+    groq._complete = rate_limited
+    with pytest.raises(RuntimeError):
+        groq.complete("hi")
+    assert groq.state == OPEN
+
+    release.set()
+    in_flight.join()
+    assert groq.calls == 2
+    assert groq.state == OPEN and not groq.allow()
+
+
+def test_half_open_probe_success_closes_the_breaker():
+    reg = ProviderRegistry(failure_threshold=3, cooldown=0.0)
+    reg.register("groq", rate_limited, lambda: True)
+    groq = reg._providers["groq"]
+    with pytest.raises(RuntimeError):
+        groq.complete("hi")
+    assert groq.state == OPEN
+
+    groq._complete = lambda prompt, timeout, **kwargs: "ok"
+    assert groq.allow()
+    groq.complete("hi")
+    assert groq.state == CLOSED
@@ -0,0 +1,118 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.pop("DATABASE_URL", None)  # revision storage is exercised on SQLite
+
+import app  # noqa: E402
+import revisions  # noqa: E402
+
+BODY = {"summary": "Backend engineer " * 20, "skills": ["Python", "Go", "SQL"],
+        "experience": [{"company": "Acme", "position": "Engineer", "description": "Built things " * 10}]}
+
+
+def version(i: int) -> dict:
+    """A resume whose i-th save changes a couple of fields, so the delta is much smaller than a snapshot."""
+    data = {**BODY, "title": f"Engineer v{i}", "contact": {"phone": f"555-{i:04d}", "city": "Berlin"}}
+    if i % 4 == 0:
+        data.pop("skills")
+    return data
+
+
+@pytest.fixture
+def resume(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "DB_PATH", str(tmp_path / "revisions.db"))
+    monkeypatch.setattr(app, "REVISION_SNAPSHOT_EVERY", 3)
+    monkeypatch.setattr(app, "REVISION_MAX", 5)
+    monkeypatch.setattr(app, "REVISION_COALESCE_SECONDS", 0)  # every save appends unless a test says otherwise
+    app.init_db()
+    conn = app.get_db()
+    user_id = app.REPO.write(conn, "user_insert", ("Jo", "jo@example.com", "x"))["id"]
+    resume_id = app.REPO.write(conn, "resume_insert", (user_id, "CV", "modern-01", "{}", None, None, None))["id"]
+    conn.commit()
+    yield conn, resume_id
+    conn.close()
+
+
+def save(conn, resume_id, data: dict):
+    app.record_revision(conn, resume_id, "CV", "modern-01", data)
+    conn.commit()
+
+
+def stored(conn, resume_id) -> dict:
+    return {r["rev"]: r for r in app.REPO.all(conn, "revision_list", (resume_id,))}
+
+
+def test_diff_and_apply_round_trip():
+    old = {"a": 1, "b": {"c": [1, 2], "d": "x"}, "gone": True}
+    new = {"a": 1, "b": {"c": [1, 2, 3], "e": None}, "added": {"f": 1}}
+    ops = revisions.diff(old, new)
+    assert revisions.apply(old, ops) == new
+    assert old == {"a": 1, "b": {"c": [1, 2], "d": "x"}, "gone": True}  # apply() does not mutate its input
+    assert revisions.diff(new, new) == []
+    assert revisions.apply({"a": 1}, revisions.diff({"a": 1}, ["not", "a", "dict"])) == ["not", "a", "dict"]
+
+
+def test_every_surviving_revision_materializes_to_what_was_saved(resume):
+    conn, resume_id = resume
+    saved = {}
+    for i in range(1, 13):
+        save(conn, resume_id, version(i))
+        saved[i] = app._revision_doc("CV", "modern-01", version(i))
+
+    rows = stored(conn, resume_id)
+    assert sorted(rows) == list(range(8, 13))  # only the newest REVISION_MAX survive
+    assert rows[8]["kind"] == "full"  # the oldest survivor was rebased onto a snapshot
+    assert rows[10]["kind"] == "full"  # (rev - 1) % REVISION_SNAPSHOT_EVERY == 0
+    assert {rows[r]["kind"] for r in (9, 11, 12)} == {"delta"}
+    for rev in rows:
+        assert app.load_revision(conn, resume_id, rev) == saved[rev]
+    assert app.load_revision(conn, resume_id, 7) is None
+
+
+def test_unchanged_save_records_nothing(resume):
+    conn, resume_id = resume
+    save(conn, resume_id, version(1))
+    save(conn, resume_id, version(1))
+    assert list(stored(conn, resume_id)) == [1]
+
+
+def test_saves_within_the_window_fold_into_the_latest_revision(resume, monkeypatch):
+    conn, resume_id = resume
+    for i in (1, 2):
+        save(conn, resume_id, version(i))
+
+    monkeypatch.setattr(app, "REVISION_COALESCE_SECONDS", 3600)
+    save(conn, resume_id, version(3))  # folds into rev 2 (a delta)
+    save(conn, resume_id, version(5))
+    rows = stored(conn, resume_id)
+    assert sorted(rows) == [1, 2]
+    assert rows[2]["saves"] == 3 and rows[2]["kind"] == "delta"
+    assert app.load_revision(conn, resume_id, 1) == app._revision_doc("CV", "modern-01", version(1))
+    assert app.load_revision(conn, resume_id, 2) == app._revision_doc("CV", "modern-01", version(5))
+
+    monkeypatch.setattr(app, "REVISION_COALESCE_SECONDS", 0)
+    for i in (6, 7, 8):
+        save(conn, resume_id, version(i))  # rev 4 is a snapshot
+    monkeypatch.setattr(app, "REVISION_COALESCE_SECONDS", 3600)
+    save(conn, resume_id, version(9))  # folds into rev 5, a delta on top of the snapshot
+    rows = stored(conn, resume_id)
+    assert sorted(rows) == [1, 2, 3, 4, 5] and rows[4]["kind"] == "full" and rows[5]["saves"] == 2
+    for rev, i in ((3, 6), (4, 7), (5, 9)):
+        assert app.load_revision(conn, resume_id, rev) == app._revision_doc("CV", "modern-01", version(i))
+
+
+def test_window_is_anchored_to_the_first_save_of_a_burst(resume, monkeypatch):
+    conn, resume_id = resume
+    clock = [1_700_000_000.0]
+    monkeypatch.setattr(app.time, "time", lambda: clock[0])
+    monkeypatch.setattr(app, "REVISION_COALESCE_SECONDS", 120)
+    for i in range(60):  # one save a minute for an hour
+        save(conn, resume_id, version(i + 1))
+        clock[0] += 60
+    rows = stored(conn, resume_id)
+    assert len(rows) == 5 and max(rows) == 30  # two saves per window; trimmed to REVISION_MAX
+    assert all(r["saves"] == 2 for r in rows.values())
+    assert app.load_revision(conn, resume_id, 30) == app._revision_doc("CV", "modern-01", version(60))
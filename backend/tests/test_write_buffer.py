@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from write_buffer import WriteBuffer  # noqa: E402
+
+
+class FakeStore:
+    """Stands in for save_resume: records every durable write; `fail` makes the next writes raise."""
+
+    def __init__(self, owners: dict):
+        self.owners  = owners  # key -> owner; writes for anyone else match nothing
+        self.writes  = []
+        self.fail    = 0
+
+    def __call__(self, key, owner, value):
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("database is locked")
+        if self.owners.get(key) != owner:
+            return None
+        self.writes.append((key, owner, value))
+        return {"id": key, "value": value}
+
+
+@pytest.fixture
+def store():
+    return FakeStore({1: "alice", 2: "bob"})
+
+
+def test_first_save_is_written_and_a_burst_is_coalesced(store):
+    buf = WriteBuffer(store, window=0.2)
+    assert buf.save(1, "alice", "v1") == ({"id": 1, "value": "v1"}, False)  # leading edge
+    for v in ("v2", "v3", "v4"):
+        assert buf.save(1, "alice", v) == (None, True)
+    assert store.writes == [(1, "alice", "v1")]
+
+    assert _wait_for(lambda: len(store.writes) == 2)  # trailing edge, after the window
+    assert store.writes[-1] == (1, "alice", "v4")
+    assert buf.snapshot()["absorbed"] == 2
+
+
+def test_flush_writes_the_buffered_version_before_a_read(store):
+    buf = WriteBuffer(store, window=60)
+    buf.save(1, "alice", "v1")
+    buf.save(1, "alice", "v2")
+    buf.flush(1)
+    assert store.writes[-1] == (1, "alice", "v2")
+    assert buf.snapshot()["pending"] == 0
+    buf.flush(1)  # nothing left: no extra write
+    assert len(store.writes) == 2
+
+
+def test_another_owner_never_coalesces_into_a_buffered_version(store):
+    buf = WriteBuffer(store, window=60)
+    buf.save(1, "alice", "v1")
+    buf.save(1, "alice", "v2")
+    assert buf.save(1, "mallory", "evil") == (None, False)  # written through, and matches nothing
+    buf.flush(1)
+    assert store.writes == [(1, "alice", "v1"), (1, "alice", "v2")]
+
+
+def test_a_save_that_matched_nothing_opens_no_window(store):
+    buf = WriteBuffer(store, window=60)
+    assert buf.save(1, "mallory", "v1") == (None, False)
+    assert buf.save(1, "mallory", "v2") == (None, False)  # not buffered: ownership was never established
+    assert store.writes == []
+
+
+def test_discard_drops_the_buffered_version(store):
+    buf = WriteBuffer(store, window=60)
+    buf.save(2, "bob", "v1")
+    buf.save(2, "bob", "v2")
+    buf.discard(2, "mallory")  # not the owner: nothing happens
+    assert buf.snapshot()["pending"] == 1
+    buf.discard(2, "bob")
+    buf.flush(2)
+    assert store.writes == [(2, "bob", "v1")]
+    assert buf.save(2, "bob", "v3") == ({"id": 2, "value": "v3"}, False)  # the window closed with it
+
+
+def test_failed_flush_keeps_the_version_and_retries(store):
+    buf = WriteBuffer(store, window=0.1)
+    buf.save(1, "alice", "v1")
+    buf.save(1, "alice", "v2")
+    store.fail = 1
+    with pytest.raises(RuntimeError):
+        buf.flush(1)
+    assert buf.snapshot()["pending"] == 1  # still buffered
+
+    store.fail = 1  # the timer's first flush fails too; it reschedules itself
+    assert buf.save(1, "alice", "v3") == (None, True)
+    assert _wait_for(lambda: store.writes[-1] == (1, "alice", "v3"))
+    assert buf.snapshot()["failedFlushes"] == 1 and buf.snapshot()["pending"] == 0
+
+
+def test_zero_window_writes_every_save(store):
+    buf = WriteBuffer(store, window=0)
+    for v in ("v1", "v2"):
+        assert buf.save(1, "alice", v)[1] is False
+    assert len(store.writes) == 2
+
+
+def _wait_for(condition, timeout: float = 3.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
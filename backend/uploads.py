@@ -0,0 +1,144 @@
+"""
+Bounded-memory handling of uploaded resume files.
+
+Multipart file parts are written to a SpooledTemporaryFile that stays in memory
+up to a small threshold and spills to disk beyond it, so a worker's RSS does not
+grow with upload size. Extractors then get a read-only, random-access view: the
+spool itself while it is in memory, an mmap of the spilled file otherwise — the
+upload is never read whole into a bytes object. The file type comes from its magic
+bytes, not from the filename the client sent.
+"""
+import io
+import mmap
+import codecs
+import zipfile
+from contextlib import contextmanager
+from tempfile import SpooledTemporaryFile
+
+from flask import Request
+
+PDF_MAGIC  = b"%PDF-"
+ZIP_MAGIC  = b"PK\x03\x04"
+OLE_MAGIC  = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # legacy .doc
+SNIFF_SIZE = 2048
+
+MAX_CONTROL_RATIO = 0.05  # share of control bytes a legacy-encoded text file may contain
+
+
+def spooled_request_class(spool_bytes: int) -> type:
+    """A Request subclass whose file uploads spill to disk once larger than `spool_bytes`."""
+
+    class SpooledRequest(Request):
+        def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+            return SpooledTemporaryFile(max_size=spool_bytes, mode="w+b")
+
+    return SpooledRequest
+
+
+class MappedFile(io.RawIOBase):
+    """Read-only raw file over an mmap, so extractors that insist on a real file object can use one."""
+
+    def __init__(self, mapped: mmap.mmap):
+        self._map = mapped
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self._map[self._pos:self._pos + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._map)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
+@contextmanager
+def open_view(stream):
+    """Yield a seekable, read-only file-like view of an uploaded file, memory-mapped once it is on disk."""
+    stream.seek(0)
+    in_memory = isinstance(stream, SpooledTemporaryFile) and not stream._rolled
+    if in_memory or isinstance(stream, io.BytesIO):
+        yield stream
+        return
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        yield stream
+        return
+    stream.seek(0, io.SEEK_END)
+    if stream.tell() == 0:  # mmap cannot map an empty file
+        yield io.BytesIO(b"")
+        return
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped, MappedFile(mapped) as raw:
+        yield io.BufferedReader(raw)
+
+
+def text_encoding(head: bytes) -> str | None:
+    """
+    The codec to read a text upload with, judged from its leading bytes; None if it is not text.
+    UTF-16 needs a BOM. Anything else must be NUL-free: strict UTF-8 when it decodes as such,
+    otherwise cp1252 (how most legacy .txt files are saved) as long as it is mostly printable.
+    """
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    if b"\x00" in head:
+        return None
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)  # tolerate a split trailing character
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        pass
+    control = sum(1 for b in head if b < 0x20 and b not in b"\t\n\r\f\x0b" or b == 0x7f)
+    return "cp1252" if control <= len(head) * MAX_CONTROL_RATIO else None
+
+
+def sniff_kind(view, max_docx_xml_bytes: int) -> str | None:
+    """
+    "pdf", "docx" or "txt" from the file's leading bytes; None for anything else.
+    A DOCX must be a zip with word/document.xml whose uncompressed size is within
+    `max_docx_xml_bytes` (a cheap guard against zip bombs).
+    """
+    view.seek(0)
+    head = view.read(SNIFF_SIZE)
+    view.seek(0)
+    if PDF_MAGIC in head[:1024]:  # the spec tolerates junk before the header
+        return "pdf"
+    if head.startswith(ZIP_MAGIC):
+        try:
+            info = zipfile.ZipFile(view).getinfo("word/document.xml")
+        except (KeyError, zipfile.BadZipFile):
+            return None
+        finally:
+            view.seek(0)
+        return "docx" if info.file_size <= max_docx_xml_bytes else None
+    if head.startswith(OLE_MAGIC):
+        return None
+    if not head:
+        return "txt"  # empty: let the caller report it as empty rather than as an unknown format
+    return "txt" if text_encoding(head) else None
+
+
+def read_text(view) -> str:
+    """Decode a text upload incrementally instead of holding its bytes and its str at once."""
+    view.seek(0)
+    encoding = text_encoding(view.read(SNIFF_SIZE)) or "utf-8-sig"
+    view.seek(0)
+    decoder, parts = codecs.getincrementaldecoder(encoding)(errors="ignore"), []
+    while True:
+        chunk = view.read(64 * 1024)
+        if not chunk:
+            break
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
@@ -0,0 +1,149 @@
+"""
+Write-behind buffer that coalesces bursts of saves to the same record.
+
+The first save of a burst is written through immediately (leading edge). Saves
+that arrive within `window` seconds of the last durable write replace a single
+buffered version (last writer wins) that a timer writes once the window ends
+(trailing edge), so N autosaves in quick succession cost two writes instead of N.
+Buffered versions are flushed early when the record is read, and all of them on
+shutdown.
+
+Only records this process has just written for the same owner are buffered, so
+ownership and existence were already checked by the write that opened the window.
+The buffer is per process: with several workers, reads routed to another worker
+can lag by up to one window.
+"""
+import time
+import threading
+
+_STRIPES = 64
+
+
+class WriteBuffer:
+    def __init__(self, write, window: float):
+        """`write(key, owner, value)` performs one durable write and returns its result (None when nothing was written)."""
+        self.write    = write
+        self.window   = window
+        self._lock    = threading.Lock()
+        self._stripes = [threading.Lock() for _ in range(_STRIPES)]  # serialise writes per key, in order
+        self._recent  = {}  # key -> (monotonic time of last durable write, owner)
+        self._pending = {}  # key -> (owner, value)
+        self._timers  = {}  # key -> Timer flushing the pending version
+        self.writes = self.buffered = self.absorbed = self.failed = 0
+
+    def _stripe(self, key):
+        return self._stripes[hash(key) % _STRIPES]
+
+    def save(self, key, owner, value) -> tuple:
+        """Returns (result, buffered). `result` is None when the value was buffered."""
+        if self.window > 0:
+            with self._lock:
+                now     = time.monotonic()
+                recent  = self._recent.get(key)
+                pending = self._pending.get(key)
+                if pending is not None:
+                    coalesce = pending[0] == owner
+                else:
+                    coalesce = recent is not None and recent[1] == owner and now - recent[0] < self.window
+                if coalesce:
+                    if pending is not None:
+                        self.absorbed += 1  # the version it replaces is never written
+                    self._pending[key] = (owner, value)
+                    self.buffered += 1
+                    if key not in self._timers:
+                        self._schedule(key, self.window - (now - recent[0]) if recent else self.window)
+                    return None, True
+        return self._write(key, owner, value), False
+
+    def _schedule(self, key, delay: float):
+        timer = threading.Timer(max(delay, 0.0), self._flush_due, (key,))
+        timer.daemon = True
+        self._timers[key] = timer
+        timer.start()
+
+    def wrote(self, key, owner):
+        """Record a durable write made outside the buffer (e.g. a create) so the next save can be coalesced."""
+        with self._lock:
+            self._recent[key] = (time.monotonic(), owner)
+
+    def _write(self, key, owner, value):
+        with self._stripe(key):
+            result = self.write(key, owner, value)
+            with self._lock:
+                self.writes += 1
+                if result is not None:
+                    self._recent[key] = (time.monotonic(), owner)
+                else:
+                    self._recent.pop(key, None)
+                self._prune()
+            return result
+
+    def _flush_due(self, key):
+        try:
+            self.flush(key)
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+                if key in self._pending and key not in self._timers:
+                    self._schedule(key, self.window)  # retry; the version is still buffered
+            print(f"[WriteBuffer] Flushing {key!r} failed: {e}")
+
+    def flush(self, key):
+        """Write the buffered version of `key`, if any, before returning."""
+        with self._stripe(key):
+            with self._lock:
+                entry = self._pending.pop(key, None)
+                timer = self._timers.pop(key, None)
+            if timer:
+                timer.cancel()
+            if entry is None:
+                return
+            try:
+                result = self.write(key, *entry)
+            except Exception:
+                with self._lock:
+                    self._pending.setdefault(key, entry)  # keep it unless a newer save replaced it
+                raise
+            with self._lock:
+                self.writes += 1
+                if result is not None:
+                    self._recent[key] = (time.monotonic(), entry[0])
+
+    def flush_owner(self, owner):
+        with self._lock:
+            keys = [k for k, (o, _) in self._pending.items() if o == owner]
+        for key in keys:
+            self.flush(key)
+
+    def flush_all(self):
+        with self._lock:
+            keys = list(self._pending)
+        for key in keys:
+            try:
+                self.flush(key)
+            except Exception as e:
+                print(f"[WriteBuffer] Flushing {key!r} failed: {e}")
+
+    def discard(self, key, owner):
+        """Drop what `owner` buffered for `key` (the record is being deleted)."""
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None and pending[0] != owner:
+                return
+            self._pending.pop(key, None)
+            self._recent.pop(key, None)
+            timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+
+    def _prune(self):
+        if len(self._recent) < 4096:
+            return
+        cutoff = time.monotonic() - self.window
+        for key in [k for k, (t, _) in self._recent.items() if t < cutoff]:
+            del self._recent[key]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"windowSeconds": self.window, "writes": self.writes, "buffered": self.buffered,
+                    "absorbed": self.absorbed, "pending": len(self._pending), "failedFlushes": self.failed}
@@ -15,6 +15,7 @@ async function callGROQAPI(text: string, mode: AIMode, section?: SectionType): P
             headers: {
                 'Content-Type': 'application/json',
                 ...(token ? { Authorization: `Bearer ${token}` } : {}),
+                'X-Request-Deadline-Ms': '14000',
             },
             body: JSON.stringify({ text, mode, section }),
             signal: AbortSignal.timeout(15000),
@@ -85,6 +86,7 @@ export async function getSkillSuggestions(input: string): Promise<string[]> {
             headers: {
                 'Content-Type': 'application/json',
                 ...(token ? { Authorization: `Bearer ${token}` } : {}),
+                'X-Request-Deadline-Ms': '9000',
             },
             body: JSON.stringify({ input }),
             signal: AbortSignal.timeout(10000),